@@ -0,0 +1,28 @@
+"""add_audio_queue_indexes
+
+Revision ID: a41be7c2d915
+Revises: c0f5fecd903b
+Create Date: 2025-09-02 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41be7c2d915'
+down_revision: Union[str, None] = 'c0f5fecd903b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audio_queue_status_created', 'audio_queue', ['status', 'created_at'], unique=False)
+    op.create_index('ix_audio_queue_started_at', 'audio_queue', ['started_processing_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audio_queue_started_at', table_name='audio_queue')
+    op.drop_index('ix_audio_queue_status_created', table_name='audio_queue')
@@ -0,0 +1,44 @@
+"""processing_settings_to_json
+
+Revision ID: 6d3fb0a8c217
+Revises: a41be7c2d915
+Create Date: 2025-09-02 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d3fb0a8c217'
+down_revision: Union[str, None] = 'a41be7c2d915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column(
+            'audio_queue', 'processing_settings',
+            type_=JSONB(),
+            postgresql_using='processing_settings::jsonb'
+        )
+    else:
+        # SQLite stores JSON as TEXT, so only the column type metadata changes
+        op.alter_column('audio_queue', 'processing_settings', type_=sa.JSON())
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column(
+            'audio_queue', 'processing_settings',
+            type_=sa.Text(),
+            postgresql_using='processing_settings::text'
+        )
+    else:
+        op.alter_column('audio_queue', 'processing_settings', type_=sa.Text())
@@ -1,8 +1,9 @@
 # database/models.py - Database Models for Analysis Prompts (FIXED ENCODING)
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, create_engine, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, JSON, create_engine, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship
 from datetime import datetime
 import os
 
@@ -165,8 +166,17 @@ class AudioQueue(Base):
     started_processing_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
-    processing_settings = Column(Text, nullable=True)  # JSON string
-    
+    # Native JSON (JSONB on Postgres) so settings round-trip as dicts
+    # without json.dumps/json.loads on every insert and read
+    processing_settings = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+
+    # Composite index covering the hot queue queries
+    # (WHERE status = ? ORDER BY created_at) plus the timeout sweep
+    __table_args__ = (
+        Index("ix_audio_queue_status_created", "status", "created_at"),
+        Index("ix_audio_queue_started_at", "started_processing_at"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -179,7 +189,8 @@ class AudioQueue(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "started_processing_at": self.started_processing_at.isoformat() if self.started_processing_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "error_message": self.error_message
+            "error_message": self.error_message,
+            "processing_settings": self.processing_settings
         }
     
 
@@ -192,12 +203,28 @@ class DatabaseManager:
             database_url = f"sqlite:///{os.path.join(os.getcwd(), 'speech_analysis.db')}"
         
         self.database_url = database_url
-        self.engine = create_engine(
-            database_url,
-            connect_args={"check_same_thread": False} if "sqlite" in database_url else {}
-        )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        
+
+        # Pool connections once at process start instead of paying the
+        # connect/handshake cost on every session checkout
+        engine_kwargs = {}
+        if "sqlite" in database_url:
+            engine_kwargs["connect_args"] = {"check_same_thread": False}
+        else:
+            engine_kwargs.update(
+                pool_size=20,
+                max_overflow=10,
+                pool_pre_ping=True,
+                pool_recycle=1800
+            )
+
+        self.engine = create_engine(database_url, **engine_kwargs)
+        self.SessionLocal = scoped_session(sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine,
+            expire_on_commit=False
+        ))
+
     def create_tables(self):
         """Create all tables"""
         try:
@@ -214,7 +241,11 @@ class DatabaseManager:
     def get_session(self):
         """Get database session"""
         return self.SessionLocal()
-        
+
+    def remove_session(self):
+        """Return the scoped session's connection to the pool"""
+        self.SessionLocal.remove()
+
     def init_default_prompts(self):
         """Initialize database with default system prompts"""
         session = self.get_session()
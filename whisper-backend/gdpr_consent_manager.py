@@ -220,10 +220,15 @@ class GDPRConsentManager:
     def get_file_hash(self, file_path: Path) -> str:
         """Generate hash of audio file for consent tracking"""
         try:
+            # Stream the whole file in 1MB chunks so the full content is
+            # covered instead of just the first 1MB; a plain read loop
+            # keeps this working on the Python 3.8 floor, where
+            # hashlib.file_digest does not exist yet
+            digest = hashlib.sha256()
             with open(file_path, 'rb') as f:
-                # Read first 1MB for hash (efficient for large files)
-                chunk = f.read(1024 * 1024)
-                return hashlib.sha256(chunk).hexdigest()[:16]
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()[:16]
         except:
             return "unknown"
 
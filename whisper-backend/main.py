@@ -35,8 +35,17 @@ from contextlib import asynccontextmanager
 from pydantic import BaseModel
 
 
+# APScheduler for periodic maintenance - optional
+try:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    SCHEDULER_AVAILABLE = True
+except ImportError:
+    AsyncIOScheduler = None
+    SCHEDULER_AVAILABLE = False
+
+
 async def periodic_queue_cleanup():
-    """Run periodic cleanup of stuck sessions"""
+    """Run periodic cleanup of stuck sessions (fallback when APScheduler is missing)"""
     while True:
         try:
             if queue_manager:
@@ -45,7 +54,7 @@ async def periodic_queue_cleanup():
                     print(f"Periodic cleanup: resolved {cleaned} stuck sessions")
         except Exception as e:
             print(f"Error in periodic cleanup: {e}")
-        
+
         # Run every 10 minutes
         await asyncio.sleep(600)
 
@@ -111,6 +120,10 @@ class LLMProcessRequest(BaseModel):
     prompt_key: str
     custom_prompt: Optional[str] = None
 
+# Pydantic model for batch queue status request
+class QueueStatusBatchRequest(BaseModel):
+    session_ids: List[str]
+
 # Fallback prompts (if database not available)
 LLM_PROMPTS = {
     "summary": {
@@ -208,7 +221,10 @@ async def lifespan(app: FastAPI):
     global queue_manager
     if DATABASE_AVAILABLE and db_manager:
         try:
-            queue_manager = AudioQueueManager(db_manager, max_concurrent=1)
+            queue_manager = AudioQueueManager(
+                db_manager, max_concurrent=1,
+                process_fn=process_audio_background
+            )
             await queue_manager.recover_stuck_sessions()  # Startup recovery
             print("✅ Queue manager initialized and recovered")
         except Exception as e:
@@ -226,16 +242,30 @@ async def lifespan(app: FastAPI):
 
     # Start background cleanup task
     cleanup_task = None
+    scheduler = None
     if queue_manager:
-        cleanup_task = asyncio.create_task(periodic_queue_cleanup())
-        print("✅ Background cleanup task started")
+        if SCHEDULER_AVAILABLE:
+            # Maintenance runs off the request path; max_instances=1 and
+            # coalesce keep slow runs from piling up on each other
+            scheduler = AsyncIOScheduler()
+            scheduler.add_job(
+                queue_manager.cleanup_expired_sessions,
+                "interval", minutes=5, max_instances=1, coalesce=True
+            )
+            scheduler.start()
+            print("✅ Background cleanup scheduled (every 5 minutes)")
+        else:
+            cleanup_task = asyncio.create_task(periodic_queue_cleanup())
+            print("✅ Background cleanup task started")
 
     # Display connection info
     await display_startup_info()
-    
+
     yield
-    
+
     # Shutdown
+    if scheduler:
+        scheduler.shutdown(wait=False)
     if cleanup_task:
         cleanup_task.cancel()
         try:
@@ -655,8 +685,13 @@ async def process_audio_background(session_id: str, file_path: Path):
         if queue_manager:
             queue_status = await queue_manager.get_queue_status(session_id)
             if queue_status and queue_status.get("processing_settings"):
-                import json
-                processing_settings = json.loads(queue_status["processing_settings"])
+                settings_value = queue_status["processing_settings"]
+                if isinstance(settings_value, str):
+                    # Rows written before the JSON column migration
+                    import json
+                    processing_settings = json.loads(settings_value)
+                else:
+                    processing_settings = settings_value
         
         # Initialize session in old system for progress tracking
         # Find this section in process_audio_background and update:
@@ -809,7 +844,22 @@ async def get_queue_stats():
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get queue stats: {str(e)}")
-    
+
+
+@app.post("/api/queue/status/batch")
+async def get_queue_status_batch(request: QueueStatusBatchRequest):
+    """Get queue status for multiple sessions in one round-trip"""
+    if not queue_manager:
+        raise HTTPException(status_code=503, detail="Queue system not available")
+
+    try:
+        statuses = await queue_manager.get_queue_statuses(request.session_ids)
+        return {
+            "statuses": statuses,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get queue statuses: {str(e)}")
 
 
 @app.get("/api/processing-status/{session_id}")
@@ -1425,8 +1475,7 @@ async def reset_queue_state():
             
             db.commit()
             
-            # Recalculate positions and start next items
-            await queue_manager._recalculate_queue_positions()
+            # Positions are derived on read now; just start next items
             started = await queue_manager.force_queue_consistency()
             
             return {
@@ -8,12 +8,52 @@ import time
 import logging
 import numpy as np
 import tempfile
+from contextlib import suppress
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple
 import librosa
 import soundfile as sf
 from collections import defaultdict, Counter
 
+# Optional fast JSON serializer (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional numba JIT for the speaker-stats group-by (falls back to np.bincount)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _accumulate_speaker_stats(speaker_inv, durations, word_counts, char_counts,
+                                  success_mask, high_conf_mask, n_speakers):
+        """Fused single-pass per-speaker accumulation over SoA segment arrays"""
+        segment_counts = np.zeros(n_speakers, dtype=np.int64)
+        duration_sums = np.zeros(n_speakers, dtype=np.float64)
+        word_sums = np.zeros(n_speakers, dtype=np.float64)
+        char_sums = np.zeros(n_speakers, dtype=np.float64)
+        success_counts = np.zeros(n_speakers, dtype=np.float64)
+        high_conf_counts = np.zeros(n_speakers, dtype=np.float64)
+
+        for i in range(len(speaker_inv)):
+            s = speaker_inv[i]
+            segment_counts[s] += 1
+            duration_sums[s] += durations[i]
+            word_sums[s] += word_counts[i]
+            char_sums[s] += char_counts[i]
+            if success_mask[i]:
+                success_counts[s] += 1
+            if high_conf_mask[i]:
+                high_conf_counts[s] += 1
+
+        return segment_counts, duration_sums, word_sums, char_sums, success_counts, high_conf_counts
+else:
+    _accumulate_speaker_stats = None
+
 # Configure logging and warnings
 logging.basicConfig(level=logging.WARNING)
 warnings.filterwarnings("ignore")
@@ -378,9 +418,13 @@ class ImprovedMultilingualSpeechPipeline:
         """
         # Load the full audio once
         audio_data, sr = librosa.load(str(audio_path), sr=16000, mono=True)
-        
+
         segment_results = []
-        
+
+        # Segments are processed sequentially on the shared Whisper model:
+        # a process pool would force every worker to re-load its own copy of
+        # the (multi-GB) model, and PyTorch already releases the GIL during
+        # inference, so in-process execution is the faster option here.
         for i, segment in enumerate(segments):
             print(f"   Processing segment {i+1}/{len(segments)} ({segment['speaker']}): {segment['duration']:.1f}s")
             
@@ -654,10 +698,11 @@ class ImprovedMultilingualSpeechPipeline:
         """Create final aligned segments with highest accuracy"""
         
         aligned_segments = []
-        
+
         for result in segment_results:
             speaker = result['speaker']
             speaker_lang_info = speaker_languages.get(speaker, {})
+            text = result.get('text', '')
             
             # Use segment language if confidence is high, otherwise use speaker primary language
             segment_lang = result.get('language', 'unknown')
@@ -683,9 +728,11 @@ class ImprovedMultilingualSpeechPipeline:
                 'start': result['start'],
                 'end': result['end'],
                 'duration': result['duration'],
-                'text': result.get('text', ''),
+                'text': text,
+                'word_count': len(text.split()),
                 'speaker': speaker,
                 'language': final_language,
+                'language_name': self.LANGUAGE_MAPPINGS.get(final_language, final_language.upper()),
                 'language_confidence': final_confidence,
                 'language_assignment_method': assignment_method,
                 'segment_language': segment_lang,
@@ -702,75 +749,143 @@ class ImprovedMultilingualSpeechPipeline:
     
     def _calculate_enhanced_speaker_stats(self, aligned_segments: List[Dict]) -> Dict:
         """Calculate enhanced speaker statistics with accuracy metrics"""
-        
+
+        if not aligned_segments:
+            return {}
+
+        # Fast path: single-speaker recordings (most dictation/interview
+        # uploads) degenerate to global totals, so skip the group-by machinery
+        unique = {seg['speaker'] for seg in aligned_segments}
+        if len(unique) == 1:
+            return self._single_speaker_stats(aligned_segments, unique.pop())
+
+        # Build structure-of-arrays views so the per-speaker totals become a
+        # single vectorized group-by instead of N Python-level iterations
+        speakers_arr = np.array([seg['speaker'] for seg in aligned_segments])
+        durations_arr = np.array([seg['duration'] for seg in aligned_segments], dtype=np.float64)
+        word_counts_arr = np.array([seg.get('word_count', len(seg['text'].split())) for seg in aligned_segments], dtype=np.float64)
+        char_counts_arr = np.array([len(seg['text']) for seg in aligned_segments], dtype=np.float64)
+        status_arr = np.array([seg.get('processing_status', 'unknown') for seg in aligned_segments])
+        conf_arr = np.array([seg.get('language_confidence', 0) for seg in aligned_segments], dtype=np.float64)
+
+        unique_speakers, first_indices, speaker_inv = np.unique(
+            speakers_arr, return_index=True, return_inverse=True
+        )
+        n_speakers = len(unique_speakers)
+
+        success_mask = status_arr == 'success'
+        high_conf_mask = success_mask & (conf_arr >= self.min_language_confidence)
+
+        if _accumulate_speaker_stats is not None:
+            (segment_counts, duration_sums, word_sums, char_sums,
+             success_counts, high_conf_counts) = _accumulate_speaker_stats(
+                speaker_inv.astype(np.int64), durations_arr, word_counts_arr,
+                char_counts_arr, success_mask, high_conf_mask, n_speakers
+            )
+        else:
+            segment_counts = np.bincount(speaker_inv, minlength=n_speakers)
+            duration_sums = np.bincount(speaker_inv, weights=durations_arr, minlength=n_speakers)
+            word_sums = np.bincount(speaker_inv, weights=word_counts_arr, minlength=n_speakers)
+            char_sums = np.bincount(speaker_inv, weights=char_counts_arr, minlength=n_speakers)
+            success_counts = np.bincount(speaker_inv, weights=success_mask.astype(np.float64), minlength=n_speakers)
+            high_conf_counts = np.bincount(speaker_inv, weights=high_conf_mask.astype(np.float64), minlength=n_speakers)
+
+        total_duration = duration_sums.sum()
+        total_words = word_sums.sum()
+
         speaker_stats = {}
-        total_duration = sum(seg['duration'] for seg in aligned_segments)
-        total_words = sum(len(seg['text'].split()) for seg in aligned_segments)
-        
-        for segment in aligned_segments:
-            speaker = segment['speaker']
-            language = segment.get('language', 'unknown')
-            
-            if speaker not in speaker_stats:
-                speaker_stats[speaker] = {
-                    'segments': 0,
-                    'total_duration': 0,
-                    'total_words': 0,
-                    'total_characters': 0,
-                    'primary_language': language,
-                    'language_name': self.LANGUAGE_MAPPINGS.get(language, language.upper()),
-                    'successful_segments': 0,
-                    'failed_segments': 0,
-                    'high_confidence_segments': 0,
-                    'language_consistency': 0.0,
-                    'average_confidence': 0.0
-                }
-            
-            stats = speaker_stats[speaker]
-            stats['segments'] += 1
-            stats['total_duration'] += segment['duration']
-            stats['total_words'] += len(segment['text'].split())
-            stats['total_characters'] += len(segment['text'])
-            
-            # Track processing quality
-            if segment.get('processing_status') == 'success':
-                stats['successful_segments'] += 1
-                
-                confidence = segment.get('language_confidence', 0)
-                if confidence >= self.min_language_confidence:
-                    stats['high_confidence_segments'] += 1
-            else:
-                stats['failed_segments'] += 1
-        
-        # Calculate derived metrics
-        for speaker, stats in speaker_stats.items():
-            stats['duration_percentage'] = (stats['total_duration'] / total_duration * 100) if total_duration > 0 else 0
-            stats['words_percentage'] = (stats['total_words'] / total_words * 100) if total_words > 0 else 0
-            
-            # Processing success rate
-            total_segments = stats['successful_segments'] + stats['failed_segments']
-            stats['processing_success_rate'] = (stats['successful_segments'] / total_segments * 100) if total_segments > 0 else 0
-            
-            # High confidence rate
-            stats['high_confidence_rate'] = (stats['high_confidence_segments'] / total_segments * 100) if total_segments > 0 else 0
-        
+        for idx, speaker in enumerate(unique_speakers):
+            language = aligned_segments[first_indices[idx]].get('language', 'unknown')
+            n_segments = int(segment_counts[idx])
+            n_success = int(success_counts[idx])
+
+            speaker_stats[speaker] = {
+                'segments': n_segments,
+                'total_duration': float(duration_sums[idx]),
+                'total_words': int(word_sums[idx]),
+                'total_characters': int(char_sums[idx]),
+                'primary_language': language,
+                'language_name': self.LANGUAGE_MAPPINGS.get(language, language.upper()),
+                'successful_segments': n_success,
+                'failed_segments': n_segments - n_success,
+                'high_confidence_segments': int(high_conf_counts[idx]),
+                'language_consistency': 0.0,
+                'average_confidence': 0.0,
+                'duration_percentage': (duration_sums[idx] / total_duration * 100) if total_duration > 0 else 0,
+                'words_percentage': (word_sums[idx] / total_words * 100) if total_words > 0 else 0,
+                'processing_success_rate': (n_success / n_segments * 100) if n_segments > 0 else 0,
+                'high_confidence_rate': (high_conf_counts[idx] / n_segments * 100) if n_segments > 0 else 0
+            }
+
         return speaker_stats
-    
+
+    def _single_speaker_stats(self, aligned_segments: List[Dict], speaker: str) -> Dict:
+        """Scalar-sum fast path for single-speaker transcripts"""
+
+        n_segments = len(aligned_segments)
+        total_duration = 0.0
+        total_words = 0
+        total_characters = 0
+        successful = 0
+        high_conf = 0
+
+        for seg in aligned_segments:
+            total_duration += seg['duration']
+            total_words += seg.get('word_count', len(seg['text'].split()))
+            total_characters += len(seg['text'])
+            if seg.get('processing_status') == 'success':
+                successful += 1
+                if seg.get('language_confidence', 0) >= self.min_language_confidence:
+                    high_conf += 1
+
+        language = aligned_segments[0].get('language', 'unknown')
+
+        return {
+            speaker: {
+                'segments': n_segments,
+                'total_duration': total_duration,
+                'total_words': total_words,
+                'total_characters': total_characters,
+                'primary_language': language,
+                'language_name': self.LANGUAGE_MAPPINGS.get(language, language.upper()),
+                'successful_segments': successful,
+                'failed_segments': n_segments - successful,
+                'high_confidence_segments': high_conf,
+                'language_consistency': 0.0,
+                'average_confidence': 0.0,
+                'duration_percentage': 100.0 if total_duration > 0 else 0,
+                'words_percentage': 100.0 if total_words > 0 else 0,
+                'processing_success_rate': (successful / n_segments * 100) if n_segments > 0 else 0,
+                'high_confidence_rate': (high_conf / n_segments * 100) if n_segments > 0 else 0
+            }
+        }
+
     def _calculate_accuracy_metrics(self, segment_results: List[Dict], aligned_segments: List[Dict]) -> Dict:
         """Calculate accuracy and quality metrics"""
         
         total_segments = len(segment_results)
-        successful_segments = len([r for r in segment_results if r.get('processing_status') == 'success'])
-        high_confidence_segments = len([r for r in segment_results if r.get('language_confidence', 0) >= self.min_language_confidence])
-        
-        # Calculate text quality (words per second)
-        text_qualities = []
-        for result in segment_results:
-            if result.get('processing_status') == 'success' and result.get('duration', 0) > 0:
-                words_per_second = len(result.get('text', '').split()) / result['duration']
-                text_qualities.append(words_per_second)
-        
-        avg_text_quality = sum(text_qualities) / len(text_qualities) if text_qualities else 0
+
+        if total_segments > 0:
+            # Vectorized masks replace per-segment Python comparisons
+            status_arr = np.array([r.get('processing_status', 'unknown') for r in segment_results])
+            conf_arr = np.array([r.get('language_confidence', 0) for r in segment_results], dtype=np.float64)
+            duration_arr = np.array([r.get('duration', 0) for r in segment_results], dtype=np.float64)
+            word_arr = np.array([len(r.get('text', '').split()) for r in segment_results], dtype=np.float64)
+
+            success_mask = status_arr == 'success'
+            high_conf_mask = conf_arr >= self.min_language_confidence
+
+            successful_segments = int(success_mask.sum())
+            high_confidence_segments = int(high_conf_mask.sum())
+
+            # Text quality (words per second) over successful, non-empty segments
+            quality_mask = success_mask & (duration_arr > 0)
+            text_qualities = word_arr[quality_mask] / duration_arr[quality_mask]
+            avg_text_quality = float(text_qualities.mean()) if text_qualities.size else 0
+        else:
+            successful_segments = 0
+            high_confidence_segments = 0
+            avg_text_quality = 0
         
         # Estimate overall accuracy based on multiple factors
         success_rate = (successful_segments / total_segments) if total_segments > 0 else 0
@@ -797,12 +912,10 @@ class ImprovedMultilingualSpeechPipeline:
     
     def _cleanup_temp_files(self):
         """Clean up temporary files"""
+        # EAFP: unlink directly rather than stat-ing each file first
         for temp_file in self.temp_files:
-            try:
-                if Path(temp_file).exists():
-                    Path(temp_file).unlink()
-            except Exception:
-                pass
+            with suppress(FileNotFoundError, OSError):
+                os.unlink(temp_file)
         self.temp_files.clear()
     
     def save_multilingual_results(self, results: Dict, output_dir: str, base_name: str):
@@ -814,34 +927,44 @@ class ImprovedMultilingualSpeechPipeline:
         print("Saving improved multilingual results...")
         
         try:
+            # Build all output paths from one prefix instead of repeated
+            # Path arithmetic; the writers all accept plain strings
+            prefix = str(output_dir / base_name)
+
             # 1. Enhanced TXT file with accuracy information
-            txt_path = output_dir / f"{base_name}_improved_multilingual.txt"
+            txt_path = f"{prefix}_improved_multilingual.txt"
             self._save_enhanced_multilingual_txt(results, txt_path)
-            
+
             # 2. JSON file with complete data
-            json_path = output_dir / f"{base_name}_improved_multilingual.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
-            
+            json_path = f"{prefix}_improved_multilingual.json"
+            if orjson is not None:
+                with open(json_path, 'wb') as f:
+                    f.write(orjson.dumps(
+                        results,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                        default=str
+                    ))
+            else:
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+
             # 3. Excel file with accuracy metrics
-            excel_path = output_dir / f"{base_name}_improved_multilingual.xlsx"
+            excel_path = f"{prefix}_improved_multilingual.xlsx"
             self._save_enhanced_multilingual_excel(results, excel_path)
-            
+
             # 4. Accuracy report
-            accuracy_path = output_dir / f"{base_name}_accuracy_report.txt"
+            accuracy_path = f"{prefix}_accuracy_report.txt"
             self._save_accuracy_report(results, accuracy_path)
-            
+
             print(f"Files saved to: {output_dir}")
-            print(f"   {txt_path.name}")
-            print(f"   {json_path.name}")
-            print(f"   {excel_path.name}")
-            print(f"   {accuracy_path.name}")
+            for saved_path in (txt_path, json_path, excel_path, accuracy_path):
+                print(f"   {os.path.basename(saved_path)}")
             print()
             
         except Exception as e:
             raise RuntimeError(f"Failed to save improved multilingual results: {e}")
     
-    def _save_enhanced_multilingual_txt(self, results: Dict, output_path: Path):
+    def _save_enhanced_multilingual_txt(self, results: Dict, output_path: Union[str, Path]):
         """Save enhanced transcript with accuracy information"""
         
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -877,12 +1000,12 @@ class ImprovedMultilingualSpeechPipeline:
                 text = segment['text']
                 language = segment.get('language', 'unknown')
                 confidence = segment.get('language_confidence', 0)
-                
+
                 start_min, start_sec = divmod(start_time, 60)
                 end_min, end_sec = divmod(end_time, 60)
-                
-                lang_name = self.LANGUAGE_MAPPINGS.get(language, language.upper())
-                
+
+                lang_name = segment.get('language_name', language.upper())
+
                 # Confidence indicator
                 if confidence >= 0.9:
                     conf_indicator = "★★★"
@@ -896,10 +1019,21 @@ class ImprovedMultilingualSpeechPipeline:
                 f.write(f"[{int(start_min):02d}:{int(start_sec):02d} - {int(end_min):02d}:{int(end_sec):02d}] ")
                 f.write(f"{speaker} ({lang_name} {conf_indicator}): {text}\n")
     
-    def _save_enhanced_multilingual_excel(self, results: Dict, output_path: Path):
+    def _save_enhanced_multilingual_excel(self, results: Dict, output_path: Union[str, Path]):
         """Save Excel file with enhanced accuracy metrics"""
-        
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+
+        # xlsxwriter in constant_memory mode streams rows to disk instead of
+        # keeping the whole workbook in memory; fall back to openpyxl
+        try:
+            import xlsxwriter  # noqa: F401
+            writer_kwargs = {
+                'engine': 'xlsxwriter',
+                'engine_kwargs': {'options': {'constant_memory': True}}
+            }
+        except ImportError:
+            writer_kwargs = {'engine': 'openpyxl'}
+
+        with pd.ExcelWriter(output_path, **writer_kwargs) as writer:
             
             # Main transcript sheet with accuracy info
             segments_data = []
@@ -913,7 +1047,7 @@ class ImprovedMultilingualSpeechPipeline:
                 end_formatted = f"{int(end_min):02d}:{int(end_sec):02d}"
                 
                 language = segment.get('language', 'unknown')
-                lang_name = self.LANGUAGE_MAPPINGS.get(language, language.upper())
+                lang_name = segment.get('language_name', language.upper())
                 
                 segments_data.append({
                     'Speaker': segment['speaker'],
@@ -968,62 +1102,71 @@ class ImprovedMultilingualSpeechPipeline:
             df_accuracy = pd.DataFrame(accuracy_data)
             df_accuracy.to_excel(writer, sheet_name='Accuracy_Metrics', index=False)
     
-    def _save_accuracy_report(self, results: Dict, output_path: Path):
+    def _save_accuracy_report(self, results: Dict, output_path: Union[str, Path]):
         """Save detailed accuracy report"""
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("IMPROVED MULTILINGUAL PIPELINE - ACCURACY REPORT\n")
-            f.write("=" * 70 + "\n\n")
-            
-            accuracy = results['accuracy_metrics']
-            metadata = results['metadata']
-            
-            # Overall accuracy
-            f.write("OVERALL ACCURACY ASSESSMENT:\n")
-            f.write(f"Estimated Accuracy: {accuracy['estimated_accuracy']:.1f}%\n")
-            f.write(f"Target Accuracy: >90%\n")
-            f.write(f"Target Achieved: {'✓ YES' if accuracy['estimated_accuracy'] >= 90 else '✗ NO'}\n\n")
-            
-            # Processing quality
-            f.write("PROCESSING QUALITY:\n")
-            f.write(f"Total Segments Processed: {accuracy['total_segments']}\n")
-            f.write(f"Successfully Processed: {accuracy['successful_segments']} ({accuracy['success_rate']:.1f}%)\n")
-            f.write(f"Failed Processing: {accuracy['failed_segments']}\n")
-            f.write(f"High Confidence Detections: {accuracy['high_confidence_segments']} ({accuracy['high_confidence_rate']:.1f}%)\n\n")
-            
-            # Language detection quality
-            f.write("LANGUAGE DETECTION QUALITY:\n")
-            lang_detection = results['language_detection']
-            f.write(f"Detection Method: {lang_detection['detection_method']}\n")
-            f.write(f"Confidence Threshold: {lang_detection['confidence_threshold']}\n")
-            f.write(f"Consensus Samples: {lang_detection['consensus_samples']}\n\n")
-            
-            # Per-speaker accuracy
-            f.write("PER-SPEAKER ACCURACY:\n")
-            for speaker, stats in results['speaker_stats'].items():
-                f.write(f"\n{speaker}:\n")
-                f.write(f"  Language: {stats.get('language_name', 'Unknown')}\n")
-                f.write(f"  Processing Success: {stats.get('processing_success_rate', 0):.1f}%\n")
-                f.write(f"  High Confidence Rate: {stats.get('high_confidence_rate', 0):.1f}%\n")
-                f.write(f"  Segments: {stats['segments']} total\n")
-                f.write(f"  Duration: {stats['total_duration']:.1f}s\n")
-            
-            # Recommendations
-            f.write(f"\nRECOMMENDATIONS:\n")
-            if accuracy['estimated_accuracy'] >= 95:
-                f.write("• Excellent accuracy achieved - results are highly reliable\n")
-            elif accuracy['estimated_accuracy'] >= 90:
-                f.write("• Good accuracy achieved - results are reliable\n")
-            elif accuracy['estimated_accuracy'] >= 80:
-                f.write("• Moderate accuracy - consider reprocessing with preprocessing\n")
-                f.write("• Check audio quality and background noise levels\n")
-            else:
-                f.write("• Low accuracy detected - audio quality issues likely\n")
-                f.write("• Strongly recommend reprocessing with preprocessing enabled\n")
-                f.write("• Consider using higher quality audio recordings\n")
-            
-            f.write(f"\nProcessing completed with {'excellent' if accuracy['estimated_accuracy'] >= 95 else 'good' if accuracy['estimated_accuracy'] >= 90 else 'moderate'} accuracy.\n")
-            f.write("=" * 70 + "\n")
+
+        accuracy = results['accuracy_metrics']
+
+        # Build the report in memory and write it in a single call
+        lines = [
+            "IMPROVED MULTILINGUAL PIPELINE - ACCURACY REPORT",
+            "=" * 70,
+            "",
+            "OVERALL ACCURACY ASSESSMENT:",
+            f"Estimated Accuracy: {accuracy['estimated_accuracy']:.1f}%",
+            "Target Accuracy: >90%",
+            f"Target Achieved: {'✓ YES' if accuracy['estimated_accuracy'] >= 90 else '✗ NO'}",
+            "",
+            "PROCESSING QUALITY:",
+            f"Total Segments Processed: {accuracy['total_segments']}",
+            f"Successfully Processed: {accuracy['successful_segments']} ({accuracy['success_rate']:.1f}%)",
+            f"Failed Processing: {accuracy['failed_segments']}",
+            f"High Confidence Detections: {accuracy['high_confidence_segments']} ({accuracy['high_confidence_rate']:.1f}%)",
+            ""
+        ]
+
+        lang_detection = results['language_detection']
+        lines.extend([
+            "LANGUAGE DETECTION QUALITY:",
+            f"Detection Method: {lang_detection['detection_method']}",
+            f"Confidence Threshold: {lang_detection['confidence_threshold']}",
+            f"Consensus Samples: {lang_detection['consensus_samples']}",
+            "",
+            "PER-SPEAKER ACCURACY:"
+        ])
+
+        for speaker, stats in results['speaker_stats'].items():
+            lines.extend([
+                "",
+                f"{speaker}:",
+                f"  Language: {stats.get('language_name', 'Unknown')}",
+                f"  Processing Success: {stats.get('processing_success_rate', 0):.1f}%",
+                f"  High Confidence Rate: {stats.get('high_confidence_rate', 0):.1f}%",
+                f"  Segments: {stats['segments']} total",
+                f"  Duration: {stats['total_duration']:.1f}s"
+            ])
+
+        lines.append("")
+        lines.append("RECOMMENDATIONS:")
+        if accuracy['estimated_accuracy'] >= 95:
+            lines.append("• Excellent accuracy achieved - results are highly reliable")
+        elif accuracy['estimated_accuracy'] >= 90:
+            lines.append("• Good accuracy achieved - results are reliable")
+        elif accuracy['estimated_accuracy'] >= 80:
+            lines.append("• Moderate accuracy - consider reprocessing with preprocessing")
+            lines.append("• Check audio quality and background noise levels")
+        else:
+            lines.append("• Low accuracy detected - audio quality issues likely")
+            lines.append("• Strongly recommend reprocessing with preprocessing enabled")
+            lines.append("• Consider using higher quality audio recordings")
+
+        quality = 'excellent' if accuracy['estimated_accuracy'] >= 95 else 'good' if accuracy['estimated_accuracy'] >= 90 else 'moderate'
+        lines.append("")
+        lines.append(f"Processing completed with {quality} accuracy.")
+        lines.append("=" * 70)
+        lines.append("")
+
+        Path(output_path).write_text('\n'.join(lines), encoding='utf-8')
     
     def print_multilingual_summary(self, results: Dict):
         """Print comprehensive multilingual processing summary"""
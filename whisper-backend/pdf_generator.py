@@ -13,7 +13,19 @@ class PDFGenerator:
         self.page_width, self.page_height = letter
         self.margin = 50
         self.line_height = 20
-    
+        self._current_font = None
+
+    def _set_font(self, canvas, name: str, size: int):
+        """Set font only when it differs from the current canvas state"""
+        if self._current_font != (name, size):
+            canvas.setFont(name, size)
+            self._current_font = (name, size)
+
+    def _new_page(self, canvas):
+        """Start a new page (showPage resets the canvas font state)"""
+        canvas.showPage()
+        self._current_font = None
+
     def generate_transcript_pdf(
         self, 
         segments: List[Dict], 
@@ -25,7 +37,8 @@ class PDFGenerator:
         try:
             # Create PDF canvas
             c = canvas.Canvas(str(output_path), pagesize=letter)
-            
+            self._current_font = None
+
             # Add title and header info
             self._add_header(c, filename, metadata)
             
@@ -47,12 +60,12 @@ class PDFGenerator:
         y_position = self.page_height - self.margin
         
         # Title
-        canvas.setFont("Helvetica-Bold", 16)
+        self._set_font(canvas, "Helvetica-Bold", 16)
         canvas.drawString(self.margin, y_position, "Audio Transcription Report")
         y_position -= 30
-        
+
         # File info
-        canvas.setFont("Helvetica", 12)
+        self._set_font(canvas, "Helvetica", 12)
         canvas.drawString(self.margin, y_position, f"File: {filename}")
         y_position -= 20
         
@@ -80,13 +93,13 @@ class PDFGenerator:
     def _add_transcript_content(self, canvas, segments: List[Dict]):
         """Add transcript segments to PDF"""
         y_position = self.page_height - 150  # Start below header
-        canvas.setFont("Helvetica", 10)
-        
+        self._set_font(canvas, "Helvetica", 10)
+
         for segment in segments:
             # Check if we need a new page
             if y_position < self.margin + 40:
-                canvas.showPage()
-                canvas.setFont("Helvetica", 10)
+                self._new_page(canvas)
+                self._set_font(canvas, "Helvetica", 10)
                 y_position = self.page_height - self.margin
             
             # Format timestamp
@@ -104,19 +117,19 @@ class PDFGenerator:
             timestamp = f"[{start_min:02d}:{start_sec:02d} - {end_min:02d}:{end_sec:02d}]"
             
             # Draw timestamp and speaker
-            canvas.setFont("Helvetica-Bold", 10)
+            self._set_font(canvas, "Helvetica-Bold", 10)
             header_text = f"{timestamp} {speaker}:"
             canvas.drawString(self.margin, y_position, header_text)
             y_position -= 15
-            
+
             # Draw text content (handle long text wrapping)
-            canvas.setFont("Helvetica", 10)
+            self._set_font(canvas, "Helvetica", 10)
             wrapped_text = self._wrap_text(text, self.page_width - 2 * self.margin - 20)
-            
+
             for line in wrapped_text:
                 if y_position < self.margin + 20:
-                    canvas.showPage()
-                    canvas.setFont("Helvetica", 10)
+                    self._new_page(canvas)
+                    self._set_font(canvas, "Helvetica", 10)
                     y_position = self.page_height - self.margin
                 
                 canvas.drawString(self.margin + 20, y_position, line)
@@ -1,298 +1,496 @@
 # queue_manager.py - Audio Processing Queue Manager
 
 import asyncio
-import json
-from datetime import datetime, timedelta 
-from typing import Optional, Dict, List
+import atexit
+import logging
+import queue
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Dict, List
+from sqlalchemy import bindparam, func, select, update
 from sqlalchemy.orm import Session
 from database.models import DatabaseManager, AudioQueue
 
+# Queue transitions fire from inside coroutines, so log records are handed
+# to a background QueueListener thread instead of doing blocking stdio on
+# the event loop
+logger = logging.getLogger("queue_manager")
+if not logger.handlers:
+    _log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+    _console_handler = logging.StreamHandler()
+    _console_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    _listener = QueueListener(_log_queue, _console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
 class AudioQueueManager:
-    def __init__(self, db_manager: DatabaseManager, max_concurrent: int = 5):
+    # Hot statements built once at class definition; executing the same
+    # Core constructs lets SQLAlchemy reuse its compiled-statement cache
+    # instead of rebuilding and recompiling the query on every call
+    _NEXT_QUEUED_STMT = (
+        select(AudioQueue)
+        .where(AudioQueue.status == "QUEUED")
+        .order_by(AudioQueue.created_at.asc())
+        .limit(1)
+    )
+    _STATUS_COUNTS_STMT = (
+        select(AudioQueue.status, func.count(AudioQueue.id))
+        .group_by(AudioQueue.status)
+    )
+    _BY_SESSION_STMT = (
+        select(AudioQueue)
+        .where(AudioQueue.session_id == bindparam("session_id"))
+        .limit(1)
+    )
+
+    def __init__(self, db_manager: DatabaseManager, max_concurrent: int = 5,
+                 process_fn: Optional[Callable[[str, Path], Awaitable[None]]] = None):
         self.db_manager = db_manager
         self.max_concurrent = max_concurrent
+        # Injected by main.py at construction; avoids importing main from
+        # the job-start hot path (and the circular import that goes with it)
+        self.process_fn = process_fn
         self.processing_semaphore = asyncio.Semaphore(max_concurrent)
-        
+        # In-memory view of the PROCESSING slot count, kept in sync by the
+        # state transitions below so admission checks never hit the DB
+        self._processing_count = 0
+        # Serialized statuses for COMPLETED/FAILED sessions; terminal rows
+        # never change, so polls can skip the DB entirely
+        self._status_cache: Dict[str, Dict] = {}
+        # Completion/failure transitions are funnelled through one worker
+        # that flushes short bursts as a single transaction (one fsync)
+        self._transition_queue: asyncio.Queue = asyncio.Queue()
+        self._transition_worker_task: Optional[asyncio.Task] = None
+
     def get_db_session(self):
         """Get database session"""
         return self.db_manager.get_session()
-    
-    async def add_to_queue(self, user_id: int, user_email: str, session_id: str, 
-                          filename: str, file_path: str, file_size: int, 
-                          processing_settings: dict) -> int:
-        """Add audio file to processing queue and return queue position"""
-        db = self.get_db_session()
+
+    @contextmanager
+    def _session(self):
+        """Scoped session from the shared pool with guaranteed cleanup"""
+        db = self.db_manager.get_session()
         try:
-            # Create queue entry
-            queue_entry = AudioQueue(
-                session_id=session_id,
-                user_id=user_id,
-                user_email=user_email,
-                filename=filename,
-                file_path=file_path,
-                file_size=file_size,
-                status="QUEUED",
-                processing_settings=json.dumps(processing_settings)
-            )
-            
-            db.add(queue_entry)
-            db.commit()
-            
-            # Calculate queue position
-            position = self._calculate_queue_position(db, session_id)
-            
-            # Update position in database
-            queue_entry.queue_position = position
-            db.commit()
-            
-            print(f"Added to queue: {filename} at position {position}")
-            return position
-            
-        except Exception as e:
-            db.rollback()
-            print(f"Error adding to queue: {e}")
-            raise
+            yield db
         finally:
-            db.close()
-    
-    def _calculate_queue_position(self, db: Session, session_id: str) -> int:
-        """Calculate current position in queue"""
-        # Count QUEUED items created before this one
-        current_item = db.query(AudioQueue).filter(AudioQueue.session_id == session_id).first()
-        if not current_item:
-            return 0
-            
-        queued_before = db.query(AudioQueue).filter(
-            AudioQueue.status == "QUEUED",
-            AudioQueue.created_at <= current_item.created_at,
-            AudioQueue.id != current_item.id
-        ).count()
-        
-        return queued_before + 1
-    
+            self.db_manager.remove_session()
+
+    async def add_to_queue(self, user_id: int, user_email: str, session_id: str,
+                          filename: str, file_path: str, file_size: int,
+                          processing_settings: dict) -> int:
+        """Add audio file to processing queue and return queue position"""
+        with self._session() as db:
+            try:
+                # The new row goes to the back of the queue, so its position
+                # is just the current QUEUED count + 1. Positions are derived
+                # from created_at rank on read, never stored
+                position = db.execute(
+                    select(func.count())
+                    .select_from(AudioQueue)
+                    .where(AudioQueue.status == "QUEUED")
+                ).scalar() + 1
+
+                queue_entry = AudioQueue(
+                    session_id=session_id,
+                    user_id=user_id,
+                    user_email=user_email,
+                    filename=filename,
+                    file_path=file_path,
+                    file_size=file_size,
+                    status="QUEUED",
+                    processing_settings=processing_settings
+                )
+
+                db.add(queue_entry)
+                db.commit()
+
+                logger.info("Added to queue: %s at position %s", filename, position)
+                return position
+
+            except Exception as e:
+                db.rollback()
+                logger.error("Error adding to queue: %s", e)
+                raise
+
     async def can_process_now(self) -> bool:
         """Check if we can start processing (have available slots)"""
-        db = self.get_db_session()
-        try:
-            processing_count = db.query(AudioQueue).filter(
-                AudioQueue.status == "PROCESSING"
-            ).count()
-            return processing_count < self.max_concurrent
-        finally:
-            db.close()
-    
+        return self._processing_count < self.max_concurrent
+
     async def get_next_queued_item(self) -> Optional[AudioQueue]:
         """Get the next item that should be processed"""
-        db = self.get_db_session()
-        try:
-            return db.query(AudioQueue).filter(
-                AudioQueue.status == "QUEUED"
-            ).order_by(AudioQueue.created_at.asc()).first()
-        finally:
-            db.close()
-    
-    
+        # Blocking query runs in a worker thread so it cannot stall the
+        # event loop; the scoped session is thread-local
+        return await asyncio.to_thread(self._get_next_queued_item_sync)
+
+    def _get_next_queued_item_sync(self) -> Optional[AudioQueue]:
+        with self._session() as db:
+            return db.execute(self._NEXT_QUEUED_STMT).scalars().first()
+
+
     async def start_processing(self, session_id: str) -> bool:
         """Mark item as processing AND start the actual background task"""
-        db = self.get_db_session()
+        # Hold a semaphore slot for the whole PROCESSING lifetime; it is
+        # released by complete_processing/fail_processing when the slot frees
+        await self.processing_semaphore.acquire()
+        claimed = False
         try:
-            queue_item = db.query(AudioQueue).filter(
-                AudioQueue.session_id == session_id
-            ).first()
-            
-            if queue_item and queue_item.status == "QUEUED":
-                queue_item.status = "PROCESSING"
-                queue_item.started_processing_at = datetime.utcnow()
-                queue_item.queue_position = 0
+            with self._session() as db:
+                # Atomic claim: the WHERE status == "QUEUED" guard means only
+                # one caller can flip the row to PROCESSING, so a concurrent
+                # start_next_if_available and a manual trigger cannot both
+                # spawn a background task for the same session
+                row = db.execute(
+                    update(AudioQueue)
+                    .where(
+                        AudioQueue.session_id == session_id,
+                        AudioQueue.status == "QUEUED"
+                    )
+                    .values(
+                        status="PROCESSING",
+                        started_processing_at=datetime.utcnow()
+                    )
+                    .returning(AudioQueue.filename, AudioQueue.file_path)
+                ).first()
                 db.commit()
-                
-                # Recalculate positions for remaining items
-                await self._recalculate_queue_positions()
-                
-                print(f"Started processing: {queue_item.filename}")
-                
-                # CRITICAL: Start the actual background processing
-                try:
-                    from pathlib import Path
-                    import asyncio
-                    # Import the processing function
-                    from main import process_audio_background
-                    
-                    # Start the actual processing task
-                    file_path = Path(queue_item.file_path)
-                    if file_path.exists():
-                        # Create background task
-                        asyncio.create_task(process_audio_background(session_id, file_path))
-                        print(f"Background processing started for: {session_id}")
-                    else:
-                        # File missing, mark as failed
-                        await self.fail_processing(session_id, "Audio file not found")
-                        return False
-                        
-                except Exception as e:
-                    print(f"Failed to start background processing: {e}")
-                    await self.fail_processing(session_id, f"Failed to start processing: {str(e)}")
+
+                if row is None:
+                    # Already claimed (or unknown session) - nothing to start
                     return False
-                
+
+                self._processing_count += 1
+                claimed = True
+
+                logger.info("Started processing: %s", row.filename)
+
+            # CRITICAL: Start the actual background processing
+            return await self._launch_background_task(session_id, row.file_path)
+        finally:
+            if not claimed:
+                self.processing_semaphore.release()
+
+    async def _launch_background_task(self, session_id: str, file_path_str: str) -> bool:
+        """Spawn the background coroutine for a freshly claimed item"""
+        try:
+            if self.process_fn is None:
+                raise RuntimeError("No process_fn configured")
+
+            file_path = Path(file_path_str)
+            if file_path.exists():
+                asyncio.create_task(self.process_fn(session_id, file_path))
+                logger.info("Background processing started for: %s", session_id)
                 return True
+
+            # File missing, mark as failed (releases the slot)
+            await self.fail_processing(session_id, "Audio file not found")
+            return False
+
+        except Exception as e:
+            logger.error("Failed to start background processing: %s", e)
+            await self.fail_processing(session_id, f"Failed to start processing: {str(e)}")
             return False
-        finally:
-            db.close()
 
     async def complete_processing(self, session_id: str):
         """Mark processing as completed and start next item"""
-        db = self.get_db_session()
-        try:
-            queue_item = db.query(AudioQueue).filter(
-                AudioQueue.session_id == session_id
-            ).first()
-            
-            if queue_item:
-                queue_item.status = "COMPLETED"
-                queue_item.completed_at = datetime.utcnow()
-                db.commit()
-                print(f"Completed processing: {queue_item.filename}")
-        finally:
-            db.close()
-        
-        # Try to start next item in queue
-        await self.start_next_if_available()
-    
+        await self._enqueue_transition(session_id, "COMPLETED", None)
+
     async def fail_processing(self, session_id: str, error_message: str):
         """Mark processing as failed and start next item"""
-        db = self.get_db_session()
+        await self._enqueue_transition(session_id, "FAILED", error_message)
+
+    async def _enqueue_transition(self, session_id: str, status: str,
+                                  error_message: Optional[str]):
+        if self._transition_worker_task is None or self._transition_worker_task.done():
+            self._transition_worker_task = asyncio.create_task(self._transition_worker())
+        await self._transition_queue.put((session_id, status, error_message))
+
+    async def _transition_worker(self):
+        """Drain completion/failure transitions, flushing bursts as one
+        transaction so N transitions cost one WAL sync instead of N"""
+        while True:
+            batch = [await self._transition_queue.get()]
+            while True:
+                try:
+                    batch.append(await asyncio.wait_for(
+                        self._transition_queue.get(), timeout=0.05
+                    ))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                released = await asyncio.to_thread(self._apply_transitions_sync, batch)
+            except Exception as e:
+                logger.error("Failed to apply queue transitions: %s", e)
+                continue
+
+            for session_id, status, error_message in batch:
+                self._status_cache.pop(session_id, None)
+                if status == "FAILED":
+                    logger.info("Failed processing: %s - %s", session_id, error_message)
+                else:
+                    logger.info("Completed processing: %s", session_id)
+
+            # Free the slots held by the sessions that were PROCESSING
+            for _ in range(released):
+                if self._processing_count > 0:
+                    self._processing_count -= 1
+                    self.processing_semaphore.release()
+
+            # A coalesced batch frees several slots at once; keep claiming
+            # until the queue is drained or the permits are used up again
+            while await self.start_next_if_available():
+                pass
+
+    def _apply_transitions_sync(self, batch: List[tuple]) -> int:
+        """Apply a batch of terminal transitions in one transaction.
+
+        Returns how many of the rows were PROCESSING before the update,
+        i.e. how many concurrency slots the caller should release.
+        """
+        session_ids = [session_id for session_id, _, _ in batch]
+        with self._session() as db:
+            prior_status = dict(db.execute(
+                select(AudioQueue.session_id, AudioQueue.status)
+                .where(AudioQueue.session_id.in_(session_ids))
+            ).all())
+
+            now = datetime.utcnow()
+            for session_id, status, error_message in batch:
+                values = {"status": status, "completed_at": now}
+                if error_message is not None:
+                    values["error_message"] = error_message
+                db.execute(
+                    update(AudioQueue)
+                    .where(AudioQueue.session_id == session_id)
+                    .values(**values)
+                )
+            db.commit()
+
+            return sum(
+                1 for session_id, _, _ in batch
+                if prior_status.get(session_id) == "PROCESSING"
+            )
+
+    async def start_next_if_available(self) -> bool:
+        """Claim and start the next queued item if slots available.
+
+        Returns True when an item was claimed, so callers that freed
+        several slots can loop until the queue or the permits run out.
+        """
+        # This runs at the end of every _transition_worker iteration and
+        # from HTTP handlers, so it must never wait for a permit: a permit
+        # can be held across a claim window before _processing_count is
+        # bumped, and blocking here would stall the very worker that
+        # releases permits. locked() and acquire() have no await point
+        # between them, so the free permit cannot be taken in between
+        if self.processing_semaphore.locked() or not await self.can_process_now():
+            return False
+        await self.processing_semaphore.acquire()
+        claimed = False
         try:
-            queue_item = db.query(AudioQueue).filter(
-                AudioQueue.session_id == session_id
-            ).first()
-            
-            if queue_item:
-                queue_item.status = "FAILED"
-                queue_item.completed_at = datetime.utcnow()
-                queue_item.error_message = error_message
-                db.commit()
-                print(f"Failed processing: {queue_item.filename} - {error_message}")
+            row = await asyncio.to_thread(self._claim_next_queued_sync)
+            if row is None:
+                return False
+            self._processing_count += 1
+            claimed = True
+            logger.info("Started processing: %s", row.filename)
+            await self._launch_background_task(row.session_id, row.file_path)
+            return True
         finally:
-            db.close()
-        
-        # Try to start next item in queue
-        await self.start_next_if_available()
-    
-    async def start_next_if_available(self):
-        """Start next queued item if slots available"""
-        if await self.can_process_now():
-            next_item = await self.get_next_queued_item()
-            if next_item:
-                await self.start_processing(next_item.session_id)
-                # Here we would trigger the actual processing
-                # This will be connected in main.py
-    
+            if not claimed:
+                self.processing_semaphore.release()
+
+    def _claim_next_queued_sync(self):
+        """Atomically claim the oldest QUEUED item, respecting the
+        concurrency limit inside the statement itself"""
+        with self._session() as db:
+            # FOR UPDATE SKIP LOCKED lets several workers pull distinct rows
+            # with zero Python-side coordination; the SQLite dialect ignores
+            # the locking clause, where its single-writer model covers us.
+            # The admission subquery keeps the PROCESSING count under
+            # max_concurrent even when completions race
+            candidate = (
+                select(AudioQueue.id)
+                .where(AudioQueue.status == "QUEUED")
+                .order_by(AudioQueue.created_at.asc())
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            admission = (
+                select(func.count())
+                .select_from(AudioQueue)
+                .where(AudioQueue.status == "PROCESSING")
+                .scalar_subquery()
+            )
+            row = db.execute(
+                update(AudioQueue)
+                .where(
+                    AudioQueue.id == candidate,
+                    admission < self.max_concurrent
+                )
+                .values(
+                    status="PROCESSING",
+                    started_processing_at=datetime.utcnow()
+                )
+                .returning(
+                    AudioQueue.session_id,
+                    AudioQueue.filename,
+                    AudioQueue.file_path
+                )
+            ).first()
+            db.commit()
+            return row
+
     async def get_queue_status(self, session_id: str) -> Optional[Dict]:
         """Get current status and position for a session"""
-        db = self.get_db_session()
-        try:
-            queue_item = db.query(AudioQueue).filter(
-                AudioQueue.session_id == session_id
-            ).first()
-            
+        cached = self._status_cache.get(session_id)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self._get_queue_status_sync, session_id)
+
+    def _get_queue_status_sync(self, session_id: str) -> Optional[Dict]:
+        with self._session() as db:
+            queue_item = db.execute(
+                self._BY_SESSION_STMT, {"session_id": session_id}
+            ).scalars().first()
+
             if not queue_item:
                 return None
-            
-            # If queued, recalculate current position
+
+            result = queue_item.to_dict()
+            # Position is the row's created_at rank among QUEUED items,
+            # derived on demand (an index-only count) instead of being
+            # rewritten across the whole queue on every dequeue
             if queue_item.status == "QUEUED":
-                current_position = self._calculate_queue_position(db, session_id)
-                queue_item.queue_position = current_position
-                db.commit()
-            
-            return queue_item.to_dict()
-        finally:
-            db.close()
-    
-    async def _recalculate_queue_positions(self):
-        """Recalculate queue positions for all queued items"""
-        db = self.get_db_session()
-        try:
-            queued_items = db.query(AudioQueue).filter(
-                AudioQueue.status == "QUEUED"
-            ).order_by(AudioQueue.created_at.asc()).all()
-            
-            for i, item in enumerate(queued_items, 1):
-                item.queue_position = i
-            
-            db.commit()
-        finally:
-            db.close()
-            
-    
+                result["queue_position"] = db.execute(
+                    select(func.count())
+                    .select_from(AudioQueue)
+                    .where(
+                        AudioQueue.status == "QUEUED",
+                        AudioQueue.created_at < queue_item.created_at
+                    )
+                ).scalar() + 1
+            else:
+                result["queue_position"] = 0
+            if queue_item.status in ("COMPLETED", "FAILED"):
+                self._status_cache[session_id] = result
+            return result
+
+    async def get_queue_statuses(self, session_ids: List[str]) -> Dict[str, Dict]:
+        """Get statuses for multiple sessions in one query"""
+        return await asyncio.to_thread(self._get_queue_statuses_sync, session_ids)
+
+    def _get_queue_statuses_sync(self, session_ids: List[str]) -> Dict[str, Dict]:
+        if not session_ids:
+            return {}
+
+        with self._session() as db:
+            # One WHERE IN query instead of a round-trip per session, plus a
+            # single ranked scan of the QUEUED set to derive positions
+            items = db.query(AudioQueue).filter(
+                AudioQueue.session_id.in_(session_ids)
+            ).all()
+            positions = dict(db.execute(
+                select(
+                    AudioQueue.session_id,
+                    func.row_number().over(order_by=AudioQueue.created_at).label("rn")
+                )
+                .where(AudioQueue.status == "QUEUED")
+            ).all())
+
+            results = {}
+            for item in items:
+                result = item.to_dict()
+                result["queue_position"] = positions.get(item.session_id, 0)
+                results[item.session_id] = result
+            return results
+
+
     async def get_queue_stats(self) -> Dict:
         """Get overall queue statistics"""
-        db = self.get_db_session()
-        try:
-            stats = {
-                "queued": db.query(AudioQueue).filter(AudioQueue.status == "QUEUED").count(),
-                "processing": db.query(AudioQueue).filter(AudioQueue.status == "PROCESSING").count(),
-                "completed": db.query(AudioQueue).filter(AudioQueue.status == "COMPLETED").count(),
-                "failed": db.query(AudioQueue).filter(AudioQueue.status == "FAILED").count(),
+        return await asyncio.to_thread(self._get_queue_stats_sync)
+
+    def _get_queue_stats_sync(self) -> Dict:
+        with self._session() as db:
+            # Single GROUP BY round-trip instead of one COUNT per status
+            counts = dict(db.execute(self._STATUS_COUNTS_STMT).all())
+            return {
+                "queued": counts.get("QUEUED", 0),
+                "processing": counts.get("PROCESSING", 0),
+                "completed": counts.get("COMPLETED", 0),
+                "failed": counts.get("FAILED", 0),
                 "max_concurrent": self.max_concurrent
             }
-            return stats
-        finally:
-            db.close()
 
 
     async def recover_stuck_sessions(self):
-        db = self.get_db_session()
-        try:
-            stuck_sessions = db.query(AudioQueue).filter(
-                AudioQueue.status == "PROCESSING"
-            ).all()
-            
-            recovered_count = 0
-            for session in stuck_sessions:
-                # Reset any PROCESSING session on startup (they can't survive server restart)
-                session.status = "FAILED"
-                session.error_message = "Processing interrupted by server restart"
-                session.completed_at = datetime.utcnow()
-                recovered_count += 1
-                print(f"Recovered stuck session: {session.session_id}")
-            
-            if recovered_count > 0:
-                db.commit()
-                await self._recalculate_queue_positions()
-                print(f"Recovered {recovered_count} stuck sessions")
-            
-        finally:
-            db.close()
+        with self._session() as db:
+            # Reset any PROCESSING session on startup (they can't survive
+            # server restart) in a single bulk UPDATE instead of loading the
+            # rows and mutating them one by one
+            recovered_ids = db.execute(
+                update(AudioQueue)
+                .where(AudioQueue.status == "PROCESSING")
+                .values(
+                    status="FAILED",
+                    error_message="Processing interrupted by server restart",
+                    completed_at=datetime.utcnow()
+                )
+                .returning(AudioQueue.session_id)
+            ).scalars().all()
+            db.commit()
+
+            for stuck_id in recovered_ids:
+                logger.info("Recovered stuck session: %s", stuck_id)
+
+            if recovered_ids:
+                logger.info("Recovered %s stuck sessions", len(recovered_ids))
 
 
     async def cleanup_expired_sessions(self):
         """Clean up sessions that have been processing too long"""
-        db = self.get_db_session()
-        try:
+        with self._session() as db:
             current_time = datetime.utcnow()
-            
-            # Find sessions processing for more than 30 minutes
-            expired_sessions = db.query(AudioQueue).filter(
-                AudioQueue.status == "PROCESSING",
-                AudioQueue.started_processing_at < current_time - timedelta(minutes=30)
-            ).all()
-            
-            cleaned_count = 0
-            for session in expired_sessions:
-                session.status = "FAILED"
-                session.error_message = "Processing timeout - exceeded 30 minutes"
-                session.completed_at = current_time
-                cleaned_count += 1
-                print(f"Cleaned expired session: {session.session_id}")
-            
+
+            # Fail all sessions processing for more than 30 minutes in one
+            # bulk UPDATE; the DB does the filtering, nothing is loaded into
+            # Python just to be mutated row by row
+            expired_ids = db.execute(
+                update(AudioQueue)
+                .where(
+                    AudioQueue.status == "PROCESSING",
+                    AudioQueue.started_processing_at < current_time - timedelta(minutes=30)
+                )
+                .values(
+                    status="FAILED",
+                    error_message="Processing timeout - exceeded 30 minutes",
+                    completed_at=current_time
+                )
+                .returning(AudioQueue.session_id)
+            ).scalars().all()
+            db.commit()
+
+            cleaned_count = len(expired_ids)
+            for expired_id in expired_ids:
+                self._status_cache.pop(expired_id, None)
+                logger.info("Cleaned expired session: %s", expired_id)
+
             if cleaned_count > 0:
-                db.commit()
-                await self._recalculate_queue_positions()
-                # Try to start next queued item
-                await self.start_next_if_available()
-            
-            return cleaned_count
-            
-        finally:
-            db.close()
-    
\ No newline at end of file
+                # Free the slots held by the timed-out sessions
+                for _ in range(cleaned_count):
+                    if self._processing_count > 0:
+                        self._processing_count -= 1
+                        self.processing_semaphore.release()
+
+        if cleaned_count > 0:
+            # Refill every slot the timed-out sessions were holding
+            while await self.start_next_if_available():
+                pass
+
+        return cleaned_count
+
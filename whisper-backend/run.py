@@ -1,15 +1,37 @@
 # run.py - GDPR Compliant Whisper + SpeechBrain Speech Diarization Pipeline
 
+import argparse
 import json
 import os
+import re
+import sys
+import numpy as np
 import pandas as pd
 import warnings
 import time
 import logging
 import atexit
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple
 
+# Optional fast JSON serializer (C implementation)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional streaming Excel writer
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Whitespace that breaks the count-the-spaces shortcut in
+# _fast_word_count: runs of spaces, or any whitespace that isn't a space
+_IRREGULAR_WHITESPACE = re.compile(r'  |[^\S ]')
+
 # Configure logging and warnings
 logging.basicConfig(level=logging.WARNING)
 warnings.filterwarnings("ignore")
@@ -33,27 +55,33 @@ class GDPRCompliantPipeline:
     """
     
     SUPPORTED_EXTENSIONS = [".mp3", ".wav", ".mp4", ".m4a", ".flac", ".ogg"]
+    TRANSCRIPTION_CHUNK_SECONDS = 300.0
     
     def __init__(
-        self, 
+        self,
         whisper_model: str = "large-v3",
         device: str = "auto",
-        enable_preprocessing: bool = True
+        enable_preprocessing: bool = True,
+        embedding_precision: Optional[str] = "float16",
+        compute_type: Optional[str] = None
     ):
         """Initialize GDPR compliant pipeline"""
-        
+
         self.whisper_model = whisper_model
         self.device = device
         self.enable_preprocessing = enable_preprocessing
+        self.embedding_precision = embedding_precision
+        self.compute_type = compute_type
         
         # Initialize GDPR manager
         self.gdpr_manager = GDPRConsentManager()
         
         # Register cleanup function
         atexit.register(self.cleanup_on_exit)
-        
-        # Track temporary files for GDPR compliance
-        self.temp_files_created = []
+
+        # Kernel-managed scratch dir for intermediate audio; unlike a plain
+        # tracked-file list, it is reclaimed even if the process dies hard
+        self._scratch = tempfile.TemporaryDirectory(prefix='gdpr_')
         
         print("GDPR Compliant Speech Diarization Pipeline")
         print("=" * 55)
@@ -75,11 +103,15 @@ class GDPRCompliantPipeline:
             # Initialize Whisper
             self.whisper_engine = WhisperEngine(
                 model_size=self.whisper_model,
-                device=self.device
+                device=self.device,
+                compute_type=self.compute_type
             )
             
-            # Initialize SpeechBrain
-            self.speechbrain_engine = SpeechBrainEngine(device=self.device)
+            # Initialize SpeechBrain (embedding forward runs in FP16 on CUDA)
+            self.speechbrain_engine = SpeechBrainEngine(
+                device=self.device,
+                embedding_precision=self.embedding_precision
+            )
             
             # Initialize preprocessor if enabled
             if self.enable_preprocessing:
@@ -104,28 +136,40 @@ class GDPRCompliantPipeline:
         num_speakers: Optional[int] = None,
         min_speakers: int = 1,
         max_speakers: int = 10,
-        apply_preprocessing: bool = False
+        apply_preprocessing: bool = False,
+        assume_consent: bool = False
     ) -> Optional[Dict]:
         """
         GDPR compliant processing with consent management
-        
+
         Returns None if consent not given
         """
-        
+
         audio_path = Path(audio_path)
-        
-        # Step 1: Display privacy notice and collect consent
-        print("GDPR COMPLIANCE: CONSENT REQUIRED")
-        print("=" * 40)
-        
-        consent_granted = self.gdpr_manager.display_privacy_notice()
-        
-        if not consent_granted:
-            print("Processing cannot continue without consent.")
-            return None
-        
-        # Step 2: Record file hash for consent tracking
-        file_hash = self.gdpr_manager.get_file_hash(audio_path)
+
+        # Hash the file in the background while the user reads the privacy
+        # notice, so big files don't add seconds after consent is given
+        with ThreadPoolExecutor(max_workers=1) as hash_executor:
+            hash_future = hash_executor.submit(self.gdpr_manager.get_file_hash, audio_path)
+
+            # Step 1: Display privacy notice and collect consent
+            print("GDPR COMPLIANCE: CONSENT REQUIRED")
+            print("=" * 40)
+
+            if assume_consent:
+                # Batch/server mode: the caller asserts consent was obtained
+                # upstream, so no blocking prompt
+                print("Consent assumed (non-interactive mode)")
+                consent_granted = True
+            else:
+                consent_granted = self.gdpr_manager.display_privacy_notice()
+
+            if not consent_granted:
+                print("Processing cannot continue without consent.")
+                return None
+
+            # Step 2: Record file hash for consent tracking
+            file_hash = hash_future.result()
         self.gdpr_manager._record_consent(granted=True, file_hash=file_hash)
         
         # Step 3: Process audio
@@ -221,6 +265,7 @@ class GDPRCompliantPipeline:
                     'total_duration': total_duration,
                     'num_speakers': len(speakers),
                     'num_segments': len(aligned_segments),
+                    'num_words': sum(seg['word_count'] for seg in aligned_segments),
                     'language': transcription_results.get('language', 'unknown'),
                     'whisper_model': self.whisper_model,
                     'device': self.device,
@@ -241,18 +286,54 @@ class GDPRCompliantPipeline:
             # GDPR: Always cleanup temporary files
             self.cleanup_temp_files()
     
+    def process_audio_batch(
+        self,
+        audio_paths: List[Union[str, Path]],
+        language: Optional[str] = None,
+        num_speakers: Optional[int] = None,
+        min_speakers: int = 1,
+        max_speakers: int = 10,
+        apply_preprocessing: bool = False
+    ) -> Dict[str, Dict]:
+        """Process several files through the already-loaded engines.
+
+        The engines are loaded once for the whole batch, so per-file cost is
+        pure inference. Files are ordered by size (a cheap proxy for
+        duration) so similarly long recordings run back-to-back and engine
+        warm-up effects are amortized. One failing file does not abort the
+        rest of the batch.
+        """
+
+        ordered = sorted((Path(p) for p in audio_paths),
+                         key=lambda p: p.stat().st_size if p.exists() else 0)
+
+        batch_results: Dict[str, Dict] = {}
+        for audio_path in ordered:
+            try:
+                batch_results[str(audio_path)] = self.process_audio(
+                    audio_path=audio_path,
+                    language=language,
+                    num_speakers=num_speakers,
+                    min_speakers=min_speakers,
+                    max_speakers=max_speakers,
+                    apply_preprocessing=apply_preprocessing
+                )
+            except Exception as e:
+                print(f"Batch item failed: {audio_path.name}: {e}")
+                batch_results[str(audio_path)] = {'error': str(e)}
+
+        return batch_results
+
     def _apply_preprocessing(self, audio_path: Path) -> Tuple[Path, Dict]:
         """Apply audio preprocessing with temp file tracking"""
         try:
             print("Applying audio preprocessing...")
             processed_path, _, metrics = self.preprocessor.process_audio(
                 audio_path=audio_path,
+                output_path=Path(self._scratch.name) / f"{audio_path.stem}_processed.wav",
                 save_original=False
             )
-            
-            # Track temp file for GDPR cleanup
-            self.temp_files_created.append(processed_path)
-            
+
             if metrics.get('processing_effective'):
                 print(f"Preprocessing changes: {metrics.get('summary', 'N/A')}")
             else:
@@ -272,42 +353,154 @@ class GDPRCompliantPipeline:
         min_speakers: int,
         max_speakers: int
     ) -> Tuple[Dict, Dict]:
-        """Process transcription and diarization"""
-        
-        # Transcription
-        print("Starting transcription...")
-        transcription_start = time.time()
-        transcription_results = self.whisper_engine.transcribe_audio(
-            audio_path=audio_path,
-            language=language,
-            word_timestamps=True
+        """Process transcription and diarization concurrently"""
+
+        stage_times = {}
+
+        def _timed(stage: str, fn, **kwargs):
+            # Each future records its own elapsed time so
+            # metadata.processing_time is populated without races
+            stage_start = time.time()
+            result = fn(**kwargs)
+            stage_times[stage] = time.time() - stage_start
+            return result
+
+        print("Starting transcription and speaker diarization...")
+
+        # Decode once at 16 kHz; both engines read the same in-memory array
+        # instead of each paying a full ffmpeg/librosa decode
+        audio_array = self.whisper_engine.load_audio(audio_path)
+
+        transcribe_kwargs = dict(
+            audio_path=audio_path, language=language, audio_array=audio_array
         )
-        transcription_time = time.time() - transcription_start
-        
-        print(f"Transcription complete: {transcription_time:.1f}s")
+        diarize_kwargs = dict(
+            audio_path=audio_path, num_speakers=num_speakers,
+            min_speakers=min_speakers, max_speakers=max_speakers,
+            audio_array=audio_array, sample_rate=16000
+        )
+
+        if self._use_serial_processing():
+            transcription_results = _timed(
+                'transcription', self._transcribe_chunked, **transcribe_kwargs
+            )
+            diarization_results = _timed(
+                'diarization', self.speechbrain_engine.diarize_audio, **diarize_kwargs
+            )
+        else:
+            # Both engines release the GIL inside their torch/C backends, so
+            # the two stages overlap and wall time approaches
+            # max(T_whisper, T_diarization) instead of their sum
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                transcription_future = executor.submit(
+                    _timed, 'transcription', self._transcribe_chunked,
+                    **transcribe_kwargs
+                )
+                diarization_future = executor.submit(
+                    _timed, 'diarization', self.speechbrain_engine.diarize_audio,
+                    **diarize_kwargs
+                )
+                transcription_results = transcription_future.result()
+                diarization_results = diarization_future.result()
+
+        print(f"Transcription complete: {stage_times['transcription']:.1f}s")
         print(f"Language: {transcription_results['language']}")
         print(f"Segments: {len(transcription_results['segments'])}")
+        print(f"Diarization complete: {stage_times['diarization']:.1f}s")
         print()
-        
-        # Diarization
-        print("Starting speaker diarization...")
-        diarization_start = time.time()
-        diarization_results = self.speechbrain_engine.diarize_audio(
-            audio_path=audio_path,
-            num_speakers=num_speakers,
-            min_speakers=min_speakers,
-            max_speakers=max_speakers
-        )
-        diarization_time = time.time() - diarization_start
-        
-        print(f"Diarization complete: {diarization_time:.1f}s")
-        print()
-        
+
         # Add timing metadata
-        transcription_results['metadata']['processing_time'] = transcription_time
-        diarization_results['metadata']['processing_time'] = diarization_time
-        
+        transcription_results['metadata']['processing_time'] = stage_times['transcription']
+        diarization_results['metadata']['processing_time'] = stage_times['diarization']
+
         return transcription_results, diarization_results
+
+    def _transcribe_chunked(self, audio_path: Path, language: Optional[str],
+                            audio_array: np.ndarray) -> Dict:
+        """Transcribe long audio as VAD-boundary chunks to cap memory.
+
+        Files at or under TRANSCRIPTION_CHUNK_SECONDS go through a single
+        call; longer ones are split at low-energy boundaries, transcribed
+        chunk by chunk, and the segments re-offset and concatenated.
+        """
+        sr = 16000
+        duration = len(audio_array) / sr
+        if duration <= self.TRANSCRIPTION_CHUNK_SECONDS:
+            return self.whisper_engine.transcribe_audio(
+                audio_path=audio_path, language=language, word_timestamps=True,
+                audio_array=audio_array, sample_rate=sr
+            )
+
+        chunks = self._chunk_by_vad(audio_array, sr)
+        merged = None
+        text_parts = []
+        for chunk_start, chunk_end in chunks:
+            chunk_result = self.whisper_engine.transcribe_audio(
+                audio_path=audio_path,
+                # Lock the language after the first chunk so detection
+                # cannot flip mid-file
+                language=language or (merged or {}).get('language'),
+                word_timestamps=True,
+                audio_array=audio_array[int(chunk_start * sr):int(chunk_end * sr)],
+                sample_rate=sr
+            )
+
+            for seg in chunk_result['segments']:
+                seg['start'] += chunk_start
+                seg['end'] += chunk_start
+                for word in seg.get('words') or []:
+                    word['start'] += chunk_start
+                    word['end'] += chunk_start
+
+            text_parts.append(chunk_result['text'])
+            if merged is None:
+                merged = chunk_result
+            else:
+                merged['segments'].extend(chunk_result['segments'])
+
+        merged['text'] = ' '.join(part for part in text_parts if part)
+        merged['metadata']['audio_duration_seconds'] = duration
+        merged['metadata']['num_chunks'] = len(chunks)
+        return merged
+
+    def _chunk_by_vad(self, audio_array: np.ndarray, sr: int) -> List[Tuple[float, float]]:
+        """Split audio at low-energy boundaries, greedily merged into chunks
+        of at most TRANSCRIPTION_CHUNK_SECONDS"""
+        max_samples = int(self.TRANSCRIPTION_CHUNK_SECONDS * sr)
+        try:
+            import librosa
+            intervals = librosa.effects.split(audio_array, top_db=35)
+        except Exception:
+            intervals = None
+
+        if intervals is None or len(intervals) == 0:
+            # Fixed-size fallback when no speech intervals are found
+            return [
+                (start / sr, min(start + max_samples, len(audio_array)) / sr)
+                for start in range(0, len(audio_array), max_samples)
+            ]
+
+        chunks = []
+        cur_start, cur_end = int(intervals[0][0]), int(intervals[0][1])
+        for interval_start, interval_end in intervals[1:]:
+            if interval_end - cur_start <= max_samples:
+                cur_end = int(interval_end)
+            else:
+                chunks.append((cur_start / sr, cur_end / sr))
+                cur_start, cur_end = int(interval_start), int(interval_end)
+        chunks.append((cur_start / sr, cur_end / sr))
+        return chunks
+
+    def _use_serial_processing(self) -> bool:
+        """Fall back to serial stages when both engines share one tight GPU"""
+        try:
+            import torch
+            if torch.cuda.is_available() and self.device != "cpu":
+                total_gb = torch.cuda.get_device_properties(0).total_memory / 1e9
+                return total_gb < 8
+        except Exception:
+            pass
+        return False
     
     def _align_results(self, transcription_results: Dict, diarization_results: Dict) -> List[Dict]:
         """Align transcription with speaker segments efficiently"""
@@ -316,85 +509,108 @@ class GDPRCompliantPipeline:
         
         whisper_segments = transcription_results['segments']
         speaker_segments = diarization_results['segments']
-        
+
+        # Structure-of-arrays view of the speaker turns, built once and
+        # sorted by start so the per-segment matching below can binary-search
+        # its candidate window instead of scanning every turn
+        s_starts = np.fromiter((s['start'] for s in speaker_segments), dtype=np.float64)
+        s_ends = np.fromiter((s['end'] for s in speaker_segments), dtype=np.float64)
+        s_labels = np.array([s['speaker'] for s in speaker_segments])
+        if s_starts.size:
+            order = np.argsort(s_starts, kind='stable')
+            s_starts, s_ends, s_labels = s_starts[order], s_ends[order], s_labels[order]
+
         aligned_segments = []
-        
+
         for w_seg in whisper_segments:
             w_start, w_end = w_seg['start'], w_seg['end']
             w_text = w_seg['text'].strip()
-            
+
             if not w_text:  # Skip empty segments
                 continue
-            
+
             # Find best matching speaker
-            best_speaker = self._find_best_speaker(w_start, w_end, speaker_segments)
-            
+            best_speaker = self._find_best_speaker(w_start, w_end, s_starts, s_ends, s_labels)
+
+            # Word count is derived once here (from Whisper's word list when
+            # present) so downstream stats never re-split the text
+            words = w_seg.get('words', [])
             aligned_segments.append({
                 'start': w_start,
                 'end': w_end,
                 'duration': w_end - w_start,
                 'text': w_text,
                 'speaker': best_speaker,
-                'words': w_seg.get('words', [])
+                'words': words,
+                'word_count': len(words) if words else self._fast_word_count(w_text)
             })
-        
+
         print(f"Alignment complete: {len(aligned_segments)} final segments")
         return aligned_segments
-    
-    def _find_best_speaker(self, w_start: float, w_end: float, speaker_segments: List[Dict]) -> str:
+
+    def _find_best_speaker(self, w_start: float, w_end: float,
+                           s_starts: np.ndarray, s_ends: np.ndarray,
+                           s_labels: np.ndarray) -> str:
         """Find best matching speaker for a transcription segment"""
-        
-        best_overlap = 0
-        best_speaker = "SPEAKER_00"
-        
-        w_duration = w_end - w_start
-        
-        for s_seg in speaker_segments:
-            s_start, s_end = s_seg['start'], s_seg['end']
-            
-            # Calculate overlap
-            overlap_start = max(w_start, s_start)
-            overlap_end = min(w_end, s_end)
-            overlap_duration = max(0, overlap_end - overlap_start)
-            
-            # Calculate overlap ratio
-            overlap_ratio = overlap_duration / w_duration if w_duration > 0 else 0
-            
-            if overlap_ratio > best_overlap:
-                best_overlap = overlap_ratio
-                best_speaker = s_seg['speaker']
-        
-        return best_speaker
+
+        if s_starts.size == 0:
+            return "SPEAKER_00"
+
+        # Speaker turns are sorted and (near-)non-overlapping, so the only
+        # candidates for [w_start, w_end] are turns starting before w_end and
+        # ending after w_start — an O(log S) window instead of a full scan
+        hi = int(np.searchsorted(s_starts, w_end, side='left'))
+        lo = int(np.searchsorted(s_ends, w_start, side='right'))
+        if lo >= hi:
+            return "SPEAKER_00"
+
+        # Overlap on the candidate slice only; the old per-turn ratio divided
+        # by a constant w_duration, so the argmax is unchanged without it
+        overlaps = np.maximum(
+            0.0,
+            np.minimum(w_end, s_ends[lo:hi]) - np.maximum(w_start, s_starts[lo:hi])
+        )
+        best_idx = int(overlaps.argmax())
+
+        if overlaps[best_idx] <= 0:
+            return "SPEAKER_00"
+        return str(s_labels[lo + best_idx])
     
     def _calculate_speaker_stats(self, aligned_segments: List[Dict]) -> Dict:
         """Calculate efficient speaker statistics"""
-        
+
+        # One pass accumulates global and per-speaker tallies together,
+        # splitting each text exactly once
         speaker_stats = {}
-        total_duration = sum(seg['duration'] for seg in aligned_segments)
-        total_words = sum(len(seg['text'].split()) for seg in aligned_segments)
-        
+        total_duration = 0.0
+        total_words = 0
+
         for segment in aligned_segments:
-            speaker = segment['speaker']
-            
-            if speaker not in speaker_stats:
-                speaker_stats[speaker] = {
-                    'segments': 0,
-                    'total_duration': 0,
-                    'total_words': 0,
-                    'total_characters': 0
-                }
-            
-            stats = speaker_stats[speaker]
+            text = segment['text']
+            word_count = segment.get('word_count')
+            if word_count is None:
+                word_count = self._fast_word_count(text)
+            duration = segment['duration']
+
+            total_duration += duration
+            total_words += word_count
+
+            stats = speaker_stats.setdefault(segment['speaker'], {
+                'segments': 0,
+                'total_duration': 0,
+                'total_words': 0,
+                'total_characters': 0
+            })
             stats['segments'] += 1
-            stats['total_duration'] += segment['duration']
-            stats['total_words'] += len(segment['text'].split())
-            stats['total_characters'] += len(segment['text'])
-        
+            stats['total_duration'] += duration
+            stats['total_words'] += word_count
+            stats['total_characters'] += len(text)
+
         # Calculate percentages
         for speaker, stats in speaker_stats.items():
             stats['duration_percentage'] = (stats['total_duration'] / total_duration * 100) if total_duration > 0 else 0
             stats['words_percentage'] = (stats['total_words'] / total_words * 100) if total_words > 0 else 0
-        
+
         return speaker_stats
     
     def save_results_with_gdpr_notice(self, results: Dict, output_dir: str, base_name: str):
@@ -404,21 +620,28 @@ class GDPRCompliantPipeline:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         print("Saving results...")
-        
+
         try:
-            # 1. TXT file with diarization
+            # Format each timestamp pair exactly once; the TXT and Excel
+            # writers both consume the shared strings instead of recomputing
+            # divmod + zero-padding per writer
+            time_strings = self._format_segment_times(results['segments'])
+
             txt_path = output_dir / f"{base_name}.txt"
-            self._save_diarization_txt(results, txt_path)
-            
-            # 2. JSON file with GDPR metadata
             json_path = output_dir / f"{base_name}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
-            
-            # 3. Excel file
             excel_path = output_dir / f"{base_name}.xlsx"
-            self._save_excel_segments(results, excel_path)
-            
+
+            # The three writers touch independent files, so their I/O can
+            # overlap on separate threads
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                writer_futures = [
+                    executor.submit(self._save_diarization_txt, results, txt_path, time_strings),
+                    executor.submit(self._save_json_results, results, json_path),
+                    executor.submit(self._save_excel_segments, results, excel_path, time_strings),
+                ]
+                for future in writer_futures:
+                    future.result()
+
             # 4. GDPR notice file
             gdpr_notice_path = output_dir / "GDPR_DATA_NOTICE.txt"
             self._save_gdpr_notice(results, gdpr_notice_path)
@@ -476,7 +699,11 @@ class GDPRCompliantPipeline:
         print("2. RIGHT TO PORTABILITY: Export/copy your data")
         print("3. CONTINUE: Keep files and exit")
         print()
-        
+
+        if not sys.stdin.isatty():
+            print("Files retained (non-interactive mode). Delete them manually anytime.")
+            return
+
         choice = input("Enter choice (1-3, default=3): ").strip()
         
         if choice == "1":
@@ -490,59 +717,125 @@ class GDPRCompliantPipeline:
         else:
             print("Files retained. You can delete them manually anytime.")
     
-    def _save_diarization_txt(self, results: Dict, output_path: Path):
+    @staticmethod
+    def _fast_word_count(text: str) -> int:
+        """Count words without allocating a token list.
+
+        A single C-level count of separators replaces str.split for the
+        common single-spaced case; runs of spaces or any non-space
+        whitespace (tabs, newlines, ...) fall back to split so counts
+        match len(text.split()) exactly.
+        """
+        stripped = text.strip()
+        if not stripped:
+            return 0
+        if _IRREGULAR_WHITESPACE.search(stripped):
+            return len(stripped.split())
+        return stripped.count(' ') + 1
+
+    @staticmethod
+    def _fmt_mmss(seconds_arr: np.ndarray) -> np.ndarray:
+        """Vectorized MM:SS formatting for an array of second offsets"""
+        total = seconds_arr.astype(np.int64)
+        minutes = np.char.zfill((total // 60).astype(str), 2)
+        secs = np.char.zfill((total % 60).astype(str), 2)
+        return np.char.add(np.char.add(minutes, ':'), secs)
+
+    @classmethod
+    def _format_segment_times(cls, segments: List[Dict]) -> List[Tuple[str, str]]:
+        """Format (start, end) of every segment as MM:SS string pairs"""
+        if not segments:
+            return []
+        # One vectorized pass over all timestamps instead of four
+        # divmod/format interpreter ops per segment
+        starts = np.fromiter((segment['start'] for segment in segments), dtype=np.float64)
+        ends = np.fromiter((segment['end'] for segment in segments), dtype=np.float64)
+        return list(zip(cls._fmt_mmss(starts), cls._fmt_mmss(ends)))
+
+    def _save_json_results(self, results: Dict, json_path: Path):
+        """Save the full results dict as JSON"""
+        if orjson is not None:
+            # orjson serializes the multi-MB results dict in C without
+            # walking it in the interpreter
+            json_path.write_bytes(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                default=str
+            ))
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+
+    def _save_diarization_txt(self, results: Dict, output_path: Path,
+                              time_strings: Optional[List[Tuple[str, str]]] = None):
         """Save diarization transcript efficiently"""
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for segment in results['segments']:
-                start_time = segment['start']
-                end_time = segment['end']
-                speaker = segment['speaker']
-                text = segment['text']
-                
-                start_min, start_sec = divmod(start_time, 60)
-                end_min, end_sec = divmod(end_time, 60)
-                
-                f.write(f"[{int(start_min):02d}:{int(start_sec):02d} - {int(end_min):02d}:{int(end_sec):02d}] ")
-                f.write(f"{speaker}: {text}\n")
+
+        if time_strings is None:
+            time_strings = self._format_segment_times(results['segments'])
+
+        # Build all lines first and issue one write instead of two buffered
+        # write calls per segment
+        lines = [
+            f"[{start_str} - {end_str}] {segment['speaker']}: {segment['text']}\n"
+            for segment, (start_str, end_str) in zip(results['segments'], time_strings)
+        ]
+        output_path.write_text("".join(lines), encoding='utf-8')
     
-    def _save_excel_segments(self, results: Dict, output_path: Path):
+    def _save_excel_segments(self, results: Dict, output_path: Path,
+                             time_strings: Optional[List[Tuple[str, str]]] = None):
         """Save Excel file efficiently"""
-        
-        segments_data = []
-        for segment in results['segments']:
-            start_time = segment['start']
-            end_time = segment['end']
-            
-            # Format timestamps
-            start_min, start_sec = divmod(start_time, 60)
-            end_min, end_sec = divmod(end_time, 60)
-            start_formatted = f"{int(start_min):02d}:{int(start_sec):02d}"
-            end_formatted = f"{int(end_min):02d}:{int(end_sec):02d}"
-            
-            segments_data.append({
+
+        if time_strings is None:
+            time_strings = self._format_segment_times(results['segments'])
+
+        if xlsxwriter is not None:
+            # constant_memory streams rows straight to disk instead of
+            # materializing the whole workbook (and a DataFrame) in memory
+            workbook = xlsxwriter.Workbook(str(output_path), {'constant_memory': True})
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, ['Speaker', 'Start_Time', 'End_Time', 'Text'])
+
+            for row, (segment, (start_str, end_str)) in enumerate(
+                zip(results['segments'], time_strings), 1
+            ):
+                worksheet.write_row(row, 0, [
+                    segment['speaker'], start_str, end_str, segment['text']
+                ])
+
+            workbook.close()
+            return
+
+        # Fallback: pandas + openpyxl
+        segments_data = [
+            {
                 'Speaker': segment['speaker'],
-                'Start_Time': start_formatted,
-                'End_Time': end_formatted,
+                'Start_Time': start_str,
+                'End_Time': end_str,
                 'Text': segment['text']
-            })
-        
+            }
+            for segment, (start_str, end_str) in zip(results['segments'], time_strings)
+        ]
+
         df = pd.DataFrame(segments_data)
         df.to_excel(output_path, index=False, engine='openpyxl')
     
     def cleanup_temp_files(self):
-        """GDPR compliant cleanup of temporary files"""
-        for temp_file in self.temp_files_created:
-            try:
-                if Path(temp_file).exists():
-                    Path(temp_file).unlink()
-            except Exception:
-                pass
-        self.temp_files_created.clear()
-    
+        """GDPR compliant cleanup of per-run scratch files"""
+        try:
+            for scratch_file in Path(self._scratch.name).iterdir():
+                try:
+                    scratch_file.unlink()
+                except OSError:
+                    pass
+        except FileNotFoundError:
+            pass
+
     def cleanup_on_exit(self):
         """Cleanup function called on program exit"""
-        self.cleanup_temp_files()
+        try:
+            self._scratch.cleanup()
+        except Exception:
+            pass
         # Clean old consent logs
         self.gdpr_manager.check_retention_policy()
     
@@ -568,6 +861,19 @@ class GDPRCompliantPipeline:
         print()
 
 
+# Process-wide pipeline instance; the Whisper model alone is multiple GB,
+# so it is loaded once and reused for every file in the session
+_PIPELINE_SINGLETON: Optional[GDPRCompliantPipeline] = None
+
+
+def get_pipeline(**kwargs) -> GDPRCompliantPipeline:
+    """Return the shared pipeline, constructing it on first use"""
+    global _PIPELINE_SINGLETON
+    if _PIPELINE_SINGLETON is None:
+        _PIPELINE_SINGLETON = GDPRCompliantPipeline(**kwargs)
+    return _PIPELINE_SINGLETON
+
+
 def find_audio_files(directory: str = ".") -> List[Path]:
     """Find audio files efficiently"""
     audio_files = []
@@ -583,8 +889,15 @@ def find_audio_files(directory: str = ".") -> List[Path]:
     return unique_files
 
 
-def select_audio_file() -> Optional[Path]:
+def select_audio_file(preselected: Optional[str] = None) -> Optional[Path]:
     """Let user select audio file with improved UX"""
+    if preselected:
+        preselected_path = Path(preselected)
+        if preselected_path.exists():
+            return preselected_path
+        print(f"Audio file not found: {preselected}")
+        return None
+
     audio_files = find_audio_files()
     
     if not audio_files:
@@ -648,49 +961,78 @@ def ask_preprocessing() -> bool:
 
 def main():
     """Main execution with GDPR compliance"""
-    
+
+    parser = argparse.ArgumentParser(description="GDPR compliant speech diarization pipeline")
+    parser.add_argument("--file", help="Audio file to process (skips interactive selection)")
+    parser.add_argument("--yes", action="store_true",
+                        help="Assume consent and prompt defaults (for batch runs)")
+    parser.add_argument("--no-preprocess", action="store_true",
+                        help="Disable audio preprocessing")
+    parser.add_argument("--output-dir", help="Directory for result files")
+    parser.add_argument("--whisper-model", default="large-v3", help="Whisper model size")
+    parser.add_argument("--device", default="auto", help="Computation device (auto/cuda/cpu)")
+    parser.add_argument("--language", default=None, help="Language code (default: auto-detect)")
+    args = parser.parse_args()
+
+    # Interactive prompts only when a human is attached and --yes not given
+    interactive = sys.stdin.isatty() and not args.yes
+
     try:
         print("GDPR Compliant Speech Diarization Pipeline")
         print("=" * 50)
-        
-        # Select audio file
-        audio_file = select_audio_file()
-        if not audio_file:
-            return
-        
-        # Ask about preprocessing
-        apply_preprocessing = ask_preprocessing()
-        
-        print()
-        
-        # Initialize GDPR compliant pipeline
-        pipeline = GDPRCompliantPipeline(
-            whisper_model="large-v3",
-            device="auto",
-            enable_preprocessing=True
-        )
-        
-        # Process audio with consent management
-        results = pipeline.request_consent_and_process(
-            audio_path=audio_file,
-            language=None,  # Auto-detect
-            apply_preprocessing=apply_preprocessing
-        )
-        
-        if results is None:
-            print("Processing cancelled - no consent given.")
-            return
-        
-        # Save results with GDPR compliance
-        output_dir = f"output_{'with' if apply_preprocessing else 'no'}_preprocessing"
-        base_name = audio_file.stem
-        pipeline.save_results_with_gdpr_notice(results, output_dir, base_name)
-        
-        # Print summary
-        pipeline.print_summary(results)
-        
-        print("Processing complete with GDPR compliance!")
-        
+
+        while True:
+            # Select audio file
+            audio_file = select_audio_file(args.file)
+            if not audio_file:
+                return
+
+            # Decide preprocessing: flag wins, then prompt, then default on
+            if args.no_preprocess:
+                apply_preprocessing = False
+            elif interactive:
+                apply_preprocessing = ask_preprocessing()
+            else:
+                apply_preprocessing = True
+
+            print()
+
+            # Shared pipeline: models load on the first file only
+            pipeline = get_pipeline(
+                whisper_model=args.whisper_model,
+                device=args.device,
+                enable_preprocessing=True
+            )
+
+            # Process audio with consent management
+            results = pipeline.request_consent_and_process(
+                audio_path=audio_file,
+                language=args.language,
+                apply_preprocessing=apply_preprocessing,
+                assume_consent=not interactive
+            )
+
+            if results is None:
+                print("Processing cancelled - no consent given.")
+                return
+
+            # Save results with GDPR compliance
+            output_dir = args.output_dir or f"output_{'with' if apply_preprocessing else 'no'}_preprocessing"
+            base_name = audio_file.stem
+            pipeline.save_results_with_gdpr_notice(results, output_dir, base_name)
+
+            # Print summary
+            pipeline.print_summary(results)
+
+            print("Processing complete with GDPR compliance!")
+
+            if args.file or not interactive:
+                break
+
+            again = input("\nProcess another file? (y/n, default=n): ").strip().lower()
+            if again not in ('y', 'yes'):
+                break
+
     except KeyboardInterrupt:
         print("\nOperation cancelled by user")
     except Exception as e:
@@ -1,19 +1,63 @@
 # whisper_engine.py - Optimized Whisper Backend Engine
 
+import contextlib
+import functools
+import itertools
+import threading
 import whisper
 import torch
 import time
 import numpy as np
 import warnings
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Union
-import librosa
+import soundfile as sf
+
+try:
+    import soxr
+except ImportError:
+    soxr = None
 
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
 warnings.filterwarnings("ignore")
 
+@functools.lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """torch.cuda.is_available() re-probes the driver on every call;
+    the answer cannot change within a process, so cache it"""
+    return torch.cuda.is_available()
+
+
+@functools.lru_cache(maxsize=1)
+def _cuda_device_info() -> Dict:
+    """Name and memory of the primary GPU, queried once"""
+    return {
+        "gpu_name": torch.cuda.get_device_name(0),
+        "gpu_memory_gb": torch.cuda.get_device_properties(0).total_memory / 1e9
+    }
+
+
+# Instantiated Silero VAD model, shared by every engine in the process
+_SILERO_VAD = None
+
+
+def _load_silero_vad():
+    """Load the Silero VAD model once per process
+
+    torch.hub caches the checkpoint on disk; this caches the
+    instantiated model and its get_speech_timestamps helper
+    """
+    global _SILERO_VAD
+    if _SILERO_VAD is None:
+        model, utils = torch.hub.load(
+            'snakers4/silero-vad', 'silero_vad', trust_repo=True
+        )
+        _SILERO_VAD = (model, utils[0])
+    return _SILERO_VAD
+
 class WhisperEngine:
     """
     Optimized Local Whisper Engine for Speech-to-Text conversion
@@ -21,118 +65,279 @@ class WhisperEngine:
     
     TARGET_SAMPLE_RATE = 16000
     
-    def __init__(self, model_size: str = "large-v3", device: str = "auto"):
+    def __init__(self, model_size: str = "large-v3", device: str = "auto",
+                 compile_model: bool = True, compute_type: Optional[str] = None,
+                 backend: str = "reference"):
         """
         Initialize Whisper Engine
-        
+
         Args:
             model_size: Model size ('tiny', 'base', 'small', 'medium', 'large', 'large-v3')
             device: Device to use ('auto', 'cuda', 'cpu')
+            compile_model: Compile the decoder forward with torch.compile on CUDA
+            compute_type: 'int8' quantizes linear layers on CPU; defaults to
+                int8 on CPU and float16 on CUDA
+            backend: 'reference' (openai-whisper) or 'faster' (CTranslate2
+                via faster-whisper, int8/float16 fused kernels); falls back
+                to reference when faster-whisper is not installed
         """
         self.model_size = model_size
         self.device = self._setup_device(device)
+        self.compile_model = compile_model
+        self.compute_type = compute_type or ("int8" if self.device == "cpu" else "float16")
+        self.backend = backend
         self.model = None
+        self._resampler = threading.local()
         self._load_model()
         
     def _setup_device(self, device: str) -> str:
         """Setup and validate device for computation"""
         if device == "auto":
-            device = "cuda" if torch.cuda.is_available() else "cpu"
+            device = "cuda" if _cuda_available() else "cpu"
         return device
     
     def _load_model(self):
         """Load Whisper model"""
+        # CTranslate2 backend: fused int8/float16 kernels and batched beam
+        # search make it several times faster than the reference decoder
+        # for identical output shape. Optional - missing install falls
+        # back to the reference backend below
+        if self.backend == "faster":
+            try:
+                from faster_whisper import WhisperModel
+                ct2_compute = "int8_float16" if self.device == "cuda" else "int8"
+                print(f"Loading faster-whisper {self.model_size} model ({ct2_compute})...")
+                self.model = WhisperModel(
+                    self.model_size, device=self.device, compute_type=ct2_compute
+                )
+                print("faster-whisper model loaded successfully")
+                return
+            except ImportError:
+                print("faster-whisper not installed, using reference backend")
+                self.backend = "reference"
+            except Exception as e:
+                print(f"faster-whisper unavailable ({e}), using reference backend")
+                self.backend = "reference"
+
         try:
             print(f"Loading Whisper {self.model_size} model...")
             self.model = whisper.load_model(self.model_size, device=self.device)
             print("Whisper model loaded successfully")
+
+            # On CPU the model is memory-bandwidth bound; dynamic int8
+            # quantization of the linear layers halves weight traffic for a
+            # negligible WER change. CUDA already runs fp16 in transcribe
+            if self.compute_type == "int8" and self.device == "cpu":
+                try:
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    print("Whisper linear layers quantized to int8 for CPU")
+                except Exception as e:
+                    print(f"int8 quantization unavailable, using fp32: {e}")
+
+            # Decoding dominates transcription time; compiling the decoder
+            # forward amortizes kernel-launch and Python dispatch overhead
+            # across the thousands of autoregressive steps on long audio.
+            # Any failure falls back to the eager model unchanged
+            if self.compile_model and self.device == "cuda" and hasattr(torch, "compile"):
+                try:
+                    self.model.decoder.forward = torch.compile(
+                        self.model.decoder.forward, mode="reduce-overhead"
+                    )
+                    # The encoder sees fixed (batch, n_mels, 3000) inputs, so
+                    # one compile fuses its conv/attention stack with no
+                    # recompilation risk; fullgraph stays off so any graph
+                    # break just leaves that region eager
+                    self.model.encoder = torch.compile(
+                        self.model.encoder, mode="reduce-overhead", fullgraph=False
+                    )
+                    print("Whisper encoder and decoder compiled (reduce-overhead)")
+                except Exception as e:
+                    print(f"torch.compile unavailable, using eager model: {e}")
         except Exception as e:
             raise RuntimeError(f"Failed to load Whisper model: {e}")
     
     def _load_audio(self, audio_path: Path) -> np.ndarray:
         """Load and preprocess audio efficiently"""
         try:
-            # Load audio with librosa - optimized for Whisper
-            audio_data, _ = librosa.load(
-                str(audio_path), 
-                sr=self.TARGET_SAMPLE_RATE,
-                mono=True,
-                res_type='kaiser_fast'  # Faster resampling
-            )
-            
-            # Ensure audio is float32 and normalized
-            audio_data = audio_data.astype(np.float32)
-            
-            # Normalize if needed
-            max_val = np.max(np.abs(audio_data))
-            if max_val > 1.0:
-                audio_data = audio_data / max_val
-            
+            # Decode straight to float32 through libsndfile - no float64
+            # intermediate and no audioread fallback machinery. librosa
+            # stays as the decoder for containers libsndfile cannot open
+            try:
+                audio_data, sr = sf.read(str(audio_path), dtype='float32', always_2d=True)
+                audio_data = audio_data.mean(axis=1) if audio_data.shape[1] > 1 else audio_data[:, 0]
+            except Exception:
+                # librosa is imported lazily: it drags in numba and takes
+                # seconds to initialize, and the common path (libsndfile
+                # decode, soxr resample) never needs it
+                import librosa
+                audio_data, sr = librosa.load(str(audio_path), sr=None, mono=True)
+                audio_data = np.asarray(audio_data, dtype=np.float32)
+
+            # Resample only when the file is not already at 16 kHz, via
+            # the SIMD soxr resampler
+            resampled = sr != self.TARGET_SAMPLE_RATE
+            if resampled:
+                audio_data = self._resample(audio_data, sr)
+
+            # libsndfile scales integer PCM into [-1, 1] on decode, so
+            # only those files can safely skip the peak scan - float and
+            # lossy subtypes (vorbis/opus/mp3) decode to float and can
+            # overshoot, and resampling can ring past full scale even
+            # for integer sources, so both keep the exact maximum
+            needs_peak_check = len(audio_data) > 0
+            if needs_peak_check and not resampled:
+                try:
+                    needs_peak_check = not sf.info(str(audio_path)).subtype.startswith('PCM_')
+                except Exception:
+                    pass  # non-libsndfile container - keep the check
+            if needs_peak_check:
+                max_val = float(np.max(np.abs(audio_data)))
+                if max_val > 1.0:
+                    np.divide(audio_data, max_val, out=audio_data)
+
             return audio_data
-            
+
         except Exception as e:
             raise RuntimeError(f"Audio loading failed: {e}")
     
+    def _resample(self, audio_data: np.ndarray, sr: int) -> np.ndarray:
+        """Resample to 16 kHz, reusing one soxr stream per input rate
+
+        Building a ResampleStream designs the polyphase filter bank once;
+        caching it skips that setup cost when many files share the same
+        source rate. Streams are mutable, and transcribe_batch decodes on
+        a thread pool, so the cache is per-thread rather than per-engine.
+        Falls back to librosa's soxr path when the soxr package is not
+        importable directly
+        """
+        if soxr is None:
+            import librosa
+            return librosa.resample(
+                audio_data, orig_sr=sr, target_sr=self.TARGET_SAMPLE_RATE,
+                res_type='soxr_hq'
+            ).astype(np.float32)
+
+        stream = getattr(self._resampler, 'stream', None)
+        if stream is None or self._resampler.rate != sr:
+            stream = soxr.ResampleStream(
+                sr, self.TARGET_SAMPLE_RATE, 1, dtype='float32', quality='HQ'
+            )
+            self._resampler.stream = stream
+            self._resampler.rate = sr
+        else:
+            stream.clear()
+
+        return stream.resample_chunk(audio_data, last=True)
+
+    def load_audio(self, audio_path: Union[str, Path]) -> np.ndarray:
+        """Decode audio to 16 kHz mono float32, shareable across engines"""
+        return self._load_audio(Path(audio_path))
+
     def get_model_info(self) -> Dict:
         """Get information about the loaded model"""
         info = {
             "model_size": self.model_size,
             "device": self.device,
-            "cuda_available": torch.cuda.is_available()
+            "cuda_available": _cuda_available()
         }
-        
-        if torch.cuda.is_available():
-            info.update({
-                "gpu_name": torch.cuda.get_device_name(0),
-                "gpu_memory_gb": torch.cuda.get_device_properties(0).total_memory / 1e9
-            })
-        
+
+        if _cuda_available():
+            info.update(_cuda_device_info())
+
         return info
     
     def transcribe_audio(
-        self, 
-        audio_path: Union[str, Path], 
+        self,
+        audio_path: Union[str, Path],
         language: Optional[str] = None,
         task: str = "transcribe",
-        word_timestamps: bool = True
+        word_timestamps: bool = True,
+        audio_array: Optional[np.ndarray] = None,
+        sample_rate: int = TARGET_SAMPLE_RATE,
+        use_vad: bool = False
     ) -> Dict:
         """
         Transcribe audio file to text with timestamps
-        
+
         Args:
             audio_path: Path to audio file
             language: Language code (e.g., 'de', 'en') or None for auto-detection
             task: 'transcribe' or 'translate'
             word_timestamps: Whether to include word-level timestamps
-            
+            audio_array: Pre-decoded mono audio; skips the internal load
+            sample_rate: Sample rate of audio_array
+            use_vad: Drop non-speech with Silero VAD before transcribing;
+                timestamps are mapped back to the original timeline
+
         Returns:
             Dictionary with transcription results
         """
         audio_path = Path(audio_path)
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
+
         start_time = time.time()
-        
+
         try:
-            # Load audio
-            audio_data = self._load_audio(audio_path)
+            # Use the caller's decoded audio when provided - saves a full
+            # ffmpeg/librosa decode when several engines share one file
+            if audio_array is not None:
+                audio_data = audio_array
+                audio_data = np.asarray(audio_data, dtype=np.float32)
+                if sample_rate != self.TARGET_SAMPLE_RATE:
+                    audio_data = self._resample(audio_data, sample_rate)
+            else:
+                audio_data = self._load_audio(audio_path)
             audio_duration = len(audio_data) / self.TARGET_SAMPLE_RATE
-            
+
             print(f"Transcribing audio: {audio_duration:.1f}s")
-            
-            # Transcribe with error handling
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                
-                result = self.model.transcribe(
-                    audio_data,
-                    language=language,
-                    task=task,
-                    word_timestamps=word_timestamps,
-                    verbose=False
+
+            # On recordings with long silences the decoder spends most of
+            # its steps on non-speech; an opt-in VAD prefilter feeds it
+            # only the speech regions and remaps timestamps afterwards
+            vad_regions = None
+            if use_vad:
+                audio_data, vad_regions = self._apply_vad(audio_data)
+
+            if self.backend == "faster":
+                precision = "int8_float16" if self.device == "cuda" else "int8"
+                result = self._transcribe_faster(
+                    audio_data, language, task, word_timestamps
                 )
+            else:
+                # Explicit precision: fp16 halves decoder memory traffic on
+                # CUDA; on CPUs with native bf16 support an autocast gives a
+                # similar bandwidth win, otherwise fp32 runs as before
+                use_fp16 = self.device == "cuda"
+                precision = "float16" if use_fp16 else "float32"
+                autocast_ctx = contextlib.nullcontext()
+                if self.device == "cpu":
+                    try:
+                        if torch.cpu._is_avx512_bf16_supported():
+                            autocast_ctx = torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+                            precision = "bfloat16"
+                    except (AttributeError, RuntimeError):
+                        pass
+
+                # Transcribe with error handling
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+
+                    with autocast_ctx:
+                        result = self.model.transcribe(
+                            audio_data,
+                            language=language,
+                            task=task,
+                            word_timestamps=word_timestamps,
+                            fp16=use_fp16,
+                            verbose=False
+                        )
             
+            if vad_regions is not None:
+                self._remap_vad_timestamps(result, vad_regions)
+
             # Calculate performance metrics
             processing_time = time.time() - start_time
             speed_ratio = audio_duration / processing_time if processing_time > 0 else 0
@@ -152,6 +357,7 @@ class WhisperEngine:
                     "speed_ratio": speed_ratio,
                     "model_size": self.model_size,
                     "device": self.device,
+                    "precision": precision,
                     "word_timestamps": word_timestamps,
                     "task": task
                 }
@@ -162,6 +368,202 @@ class WhisperEngine:
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {e}")
     
+    def _apply_vad(self, audio_data: np.ndarray):
+        """Drop non-speech regions with Silero VAD
+
+        Returns the concatenated speech-only signal plus a list of
+        (compacted_start_s, original_start_s, duration_s) regions for
+        mapping timestamps back. Any failure - including an absent
+        model download - returns the input unchanged with no regions
+        """
+        try:
+            model, get_speech_timestamps = _load_silero_vad()
+            speech = get_speech_timestamps(
+                torch.from_numpy(audio_data), model,
+                sampling_rate=self.TARGET_SAMPLE_RATE
+            )
+        except Exception as e:
+            print(f"Silero VAD unavailable, transcribing full audio: {e}")
+            return audio_data, None
+
+        if not speech:
+            return audio_data, None
+
+        regions = []
+        position = 0.0
+        for ts in speech:
+            duration = (ts['end'] - ts['start']) / self.TARGET_SAMPLE_RATE
+            regions.append((position, ts['start'] / self.TARGET_SAMPLE_RATE, duration))
+            position += duration
+
+        compacted = np.concatenate(
+            [audio_data[ts['start']:ts['end']] for ts in speech]
+        )
+        kept_pct = 100.0 * len(compacted) / len(audio_data)
+        print(f"VAD kept {kept_pct:.0f}% of audio ({len(speech)} speech regions)")
+        return compacted, regions
+
+    def _remap_vad_timestamps(self, result: Dict, regions) -> None:
+        """Map compacted-timeline timestamps back to the original audio"""
+        compacted_starts = np.array([region[0] for region in regions])
+
+        def remap(t):
+            idx = max(int(np.searchsorted(compacted_starts, t, side='right')) - 1, 0)
+            compacted_start, original_start, duration = regions[idx]
+            return original_start + min(max(t - compacted_start, 0.0), duration)
+
+        for segment in result.get('segments', []):
+            segment['start'] = remap(segment.get('start', 0.0))
+            segment['end'] = remap(segment.get('end', 0.0))
+            for word_info in segment.get('words') or []:
+                if isinstance(word_info, dict):
+                    word_info['start'] = remap(word_info.get('start', 0.0))
+                    word_info['end'] = remap(word_info.get('end', 0.0))
+
+    def transcribe_batch(
+        self,
+        audio_paths: List[Union[str, Path]],
+        language: Optional[str] = None,
+        task: str = "transcribe",
+        max_batch: int = 8
+    ) -> List[Dict]:
+        """
+        Transcribe several audio files with batched model passes
+
+        Clips that fit whisper's 30 s window are padded to one mel batch
+        and decoded together, so the encoder (and the batched decoder
+        behind whisper.decode) runs once per mini-batch instead of once
+        per file. Longer files - and the faster-whisper backend, which
+        batches internally - fall back to transcribe_audio per file.
+        Word timestamps are not produced on the batched path, so they
+        are disabled throughout for consistent output shape.
+
+        Args:
+            audio_paths: Audio files to transcribe
+            language: Language code or None for auto-detection
+            task: 'transcribe' or 'translate'
+            max_batch: Files decoded per batched forward
+
+        Returns:
+            List of result dictionaries, one per input file, in order
+        """
+        paths = [Path(p) for p in audio_paths]
+        if not paths:
+            return []
+
+        # Decode inputs in parallel - libsndfile and soxr release the GIL
+        with ThreadPoolExecutor(max_workers=min(4, len(paths))) as pool:
+            audios = list(pool.map(self._load_audio, paths))
+
+        results: List[Optional[Dict]] = [None] * len(paths)
+
+        batchable = [
+            i for i, audio in enumerate(audios)
+            if self.backend != "faster" and len(audio) <= whisper.audio.N_SAMPLES
+        ]
+        batchable_set = set(batchable)
+
+        for i, (path, audio) in enumerate(zip(paths, audios)):
+            if i not in batchable_set:
+                results[i] = self.transcribe_audio(
+                    path, language=language, task=task,
+                    word_timestamps=False, audio_array=audio
+                )
+
+        if not batchable:
+            return results
+
+        use_fp16 = self.device == "cuda"
+        n_mels = self.model.dims.n_mels
+        options = whisper.DecodingOptions(
+            language=language, task=task, fp16=use_fp16, without_timestamps=True
+        )
+
+        for start in range(0, len(batchable), max_batch):
+            group = batchable[start:start + max_batch]
+            batch_start = time.time()
+
+            mel_batch = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(audios[i]), n_mels=n_mels
+                )
+                for i in group
+            ]).to(self.device)
+
+            with torch.inference_mode():
+                decoded = whisper.decode(self.model, mel_batch, options)
+
+            per_item_time = (time.time() - batch_start) / len(group)
+
+            for i, decoding in zip(group, decoded):
+                audio_duration = len(audios[i]) / self.TARGET_SAMPLE_RATE
+                results[i] = {
+                    "text": decoding.text.strip(),
+                    "language": decoding.language,
+                    "segments": [{
+                        'id': 0,
+                        'start': 0.0,
+                        'end': audio_duration,
+                        'text': decoding.text,
+                        'words': []
+                    }],
+                    "metadata": {
+                        "file_name": paths[i].name,
+                        "file_size_mb": paths[i].stat().st_size / 1e6,
+                        "audio_duration_seconds": audio_duration,
+                        "processing_time_seconds": per_item_time,
+                        "speed_ratio": audio_duration / per_item_time if per_item_time > 0 else 0,
+                        "model_size": self.model_size,
+                        "device": self.device,
+                        "precision": "float16" if use_fp16 else "float32",
+                        "word_timestamps": False,
+                        "task": task,
+                        "batch_size": len(group)
+                    }
+                }
+
+        return results
+
+    def _transcribe_faster(self, audio_data: np.ndarray, language: Optional[str],
+                           task: str, word_timestamps: bool) -> Dict:
+        """Run the faster-whisper backend and shape its output like the
+        reference transcribe() dict, so downstream code needs no changes"""
+        segment_gen, info = self.model.transcribe(
+            audio_data,
+            language=language,
+            task=task,
+            word_timestamps=word_timestamps
+        )
+
+        segments = []
+        texts = []
+        for i, seg in enumerate(segment_gen):
+            words = []
+            if word_timestamps and seg.words:
+                words = [
+                    {
+                        'word': w.word,
+                        'start': w.start,
+                        'end': w.end,
+                        'probability': w.probability
+                    }
+                    for w in seg.words
+                ]
+            segments.append({
+                'id': i,
+                'start': seg.start,
+                'end': seg.end,
+                'text': seg.text,
+                'words': words
+            })
+            texts.append(seg.text)
+
+        return {
+            "text": "".join(texts),
+            "language": info.language,
+            "segments": segments
+        }
+
     def get_word_level_timestamps(self, results: Dict) -> List[Dict]:
         """
         Extract word-level timestamps from results
@@ -169,22 +571,21 @@ class WhisperEngine:
         Returns:
             List of dictionaries with word, start, end, confidence
         """
-        words = []
-        
-        for segment in results.get('segments', []):
-            segment_words = segment.get('words', [])
-            for word_info in segment_words:
-                try:
-                    words.append({
-                        'word': word_info.get('word', '').strip(),
-                        'start': word_info.get('start', 0),
-                        'end': word_info.get('end', 0),
-                        'confidence': word_info.get('probability', 1.0)
-                    })
-                except (KeyError, TypeError):
-                    continue  # Skip malformed word entries
-        
-        return words
+        # Single comprehension over a chained iterator: no per-word
+        # try/except setup, one list built at C speed. An isinstance
+        # check drops malformed entries like the old handler did
+        return [
+            {
+                'word': (word_info.get('word') or '').strip(),
+                'start': word_info.get('start', 0),
+                'end': word_info.get('end', 0),
+                'confidence': word_info.get('probability', 1.0)
+            }
+            for word_info in itertools.chain.from_iterable(
+                segment.get('words', ()) for segment in results.get('segments', ())
+            )
+            if isinstance(word_info, dict)
+        ]
     
     def __del__(self):
         """Cleanup resources safely"""
@@ -193,7 +594,7 @@ class WhisperEngine:
                 del self.model
             # Safe CUDA cleanup
             import torch
-            if torch is not None and hasattr(torch, 'cuda') and torch.cuda.is_available():
+            if torch is not None and hasattr(torch, 'cuda') and _cuda_available():
                 torch.cuda.empty_cache()
         except Exception:
             pass
\ No newline at end of file